@@ -1,6 +1,5 @@
-from agno.agent import Agent
-from agno.models.google import Gemini
 from textwrap import dedent
+from functools import lru_cache
 from pydantic import BaseModel, Field, ConfigDict
 from typing import List
 
@@ -57,31 +56,74 @@ class DemoSummary(BaseModel):
     )
 
 
-info_extractor = Agent(
-    model=Gemini(id="gemini-2.0-flash-001", response_modalities=["text"]),
-    description=dedent(
-        """\
-        Extracts key information from product demo call transcriptions.
-        Analyzes conversation context to identify product details, prospect pain points,
-        demonstrated features with timestamps, and actionable next steps, structuring
-        the output for microsite generation."""
-    ),
-    instructions=dedent(
-        """\
-        Given a timestamped product demo call transcription, extract the following information.
-        Format your response strictly as a JSON object validated by the `DemoSummary` Pydantic model.
+def build_info_extractor():
+    """
+    Builds a new information extraction agent. An agent keeps the state of its current run,
+    so extractions that run concurrently (e.g. one per transcript chunk) each need their own.
+    """
+    from agno.agent import Agent
+    from agno.models.google import Gemini
 
-        **Extraction Rules:**
-        1. **Product Name:** Identify the primary product or solution discussed.
-        2. **Prospect Company:** Determine the name of the prospective customer's organization.
-        3. **Sales Rep:** Identify the name of the sales representative.
-        4. **Summary Points:** Provide 3-5 concise, high-level bullet points summarizing the entire demo.
-        5. **Pain Points Discussed:** List specific challenges or problems the prospect mentioned.
-        6. **Features Demonstrated:** For each feature explicitly shown or discussed in detail, provide a dictionary with 'name' (the feature name), 'timestamp_start' (start time, e.g., '00:05:10'), and 'timestamp_end' (end time, e.g., '00:08:45'). If a feature is mentioned but not demonstrated, do not include timestamps.
-        7. **Next Steps:** List any clear action items or agreed-upon follow-ups for either party.
-        8. **Unanswered Questions:** List any specific questions posed by the prospect that were not fully resolved during the call.
-        9. **Strict JSON Output:** Ensure the output is valid JSON and perfectly matches the structure defined by the `DemoSummary` model. Do not include any extra text or conversational filler outside the JSON.
-        """
-    ),
-    # response_model=DemoSummary,
-)
+    return Agent(
+        model=Gemini(id="gemini-2.0-flash-001", response_modalities=["text"]),
+        description=dedent(
+            """\
+            Extracts key information from product demo call transcriptions.
+            Analyzes conversation context to identify product details, prospect pain points,
+            demonstrated features with timestamps, and actionable next steps, structuring
+            the output for microsite generation."""
+        ),
+        instructions=dedent(
+            """\
+            Given a timestamped product demo call transcription, extract the following information.
+            Format your response strictly as a JSON object validated by the `DemoSummary` Pydantic model.
+
+            **Extraction Rules:**
+            1. **Product Name:** Identify the primary product or solution discussed.
+            2. **Prospect Company:** Determine the name of the prospective customer's organization.
+            3. **Sales Rep:** Identify the name of the sales representative.
+            4. **Summary Points:** Provide 3-5 concise, high-level bullet points summarizing the entire demo.
+            5. **Pain Points Discussed:** List specific challenges or problems the prospect mentioned.
+            6. **Features Demonstrated:** For each feature explicitly shown or discussed in detail, provide a dictionary with 'name' (the feature name), 'timestamp_start' (start time, e.g., '00:05:10'), and 'timestamp_end' (end time, e.g., '00:08:45'). If a feature is mentioned but not demonstrated, do not include timestamps.
+            7. **Next Steps:** List any clear action items or agreed-upon follow-ups for either party.
+            8. **Unanswered Questions:** List any specific questions posed by the prospect that were not fully resolved during the call.
+            9. **Strict JSON Output:** Ensure the output is valid JSON and perfectly matches the structure defined by the `DemoSummary` model. Do not include any extra text or conversational filler outside the JSON.
+            """
+        ),
+        # response_model=DemoSummary,
+    )
+
+
+@lru_cache(maxsize=None)
+def get_info_extractor():
+    """Returns the shared information extraction agent, building it on first call."""
+    return build_info_extractor()
+
+
+@lru_cache(maxsize=None)
+def get_summary_reconciler():
+    """
+    Returns the shared agent that settles conflicting values left after merging the
+    extractions of transcript chunks, building it on first call.
+    """
+    from agno.agent import Agent
+    from agno.models.google import Gemini
+
+    return Agent(
+        model=Gemini(id="gemini-2.0-flash-001", response_modalities=["text"]),
+        description=dedent(
+            """\
+            Reconciles a product demo summary merged from the extractions of separate
+            parts of the same call transcription."""
+        ),
+        instructions=dedent(
+            """\
+            You are given a JSON object with a merged `summary` (matching the `DemoSummary` Pydantic model) and `conflicts`, mapping field names to the candidate values that different parts of the call produced for that field.
+
+            **Rules:**
+            1. For each field in `conflicts`, choose the single correct value from its candidates, using the rest of the summary as context. Prefer the most complete form of a name.
+            2. Leave every other field of the summary exactly as given.
+            3. **Strict JSON Output:** Respond with the complete summary only, as valid JSON matching the `DemoSummary` model. Do not include any extra text or conversational filler outside the JSON.
+            """
+        ),
+    )
@@ -1,6 +1,5 @@
-from agno.agent import Agent
-from agno.models.google import Gemini
 from textwrap import dedent
+from functools import lru_cache
 from pydantic import BaseModel
 
 
@@ -8,37 +7,100 @@ class Transcription(BaseModel):
     transcription: str
 
 
-transcription_agent = Agent(
-    model=Gemini(id="gemini-2.0-flash-lite", response_modalities=["text"]),
-    description=dedent(
-        """\
-                Highly accurate, verbatim audio-to-text transcription service.
-                Converts spoken words into a detailed textual record, preserving crucial temporal context and speaker identification."""
-    ),
-    instructions=dedent(
-        """\
-                Strictly follow these rules for verbatim transcription with timestamps and speaker identification.
-                Output the transcription as a continuous string, with each segment on a new line.
-
-                **Output Format:**
-                [HH:MM:SS - HH:MM:SS] Speaker Name: Transcribed verbatim speech
-
-                **Transcription Rules (Strictly Adhere to All):**
-
-                1.  **Verbatim Accuracy:** Transcribe every single word exactly as heard.
-                2.  **No Interpretation/Summarization:** Do not summarize, interpret, or rephrase speech. Transcribe only what is explicitly said.
-                3.  **Unclear Speech:** Use '[inaudible]' for any speech that cannot be clearly understood.
-                4.  **Pauses:** Indicate pauses longer than 2 seconds with '...' (three periods) directly within the transcribed text.
-                5.  **No Punctuation/Formatting:** Do not add any punctuation (commas, periods, question marks, etc.) or apply any text formatting (bold, italics).
-                6.  **Preserve Filler Words:** Include all filler words (e.g., 'um', 'uh', 'like', 'you know').
-
-                **Example of Desired Output:**
-                [00:00:00 - 00:00:05] Sales Rep: Good morning Jane thanks for joining the call
-                [00:00:05 - 00:00:12] Prospect: Hi Alice excited to learn more about the Microsite Pilot
-                [00:00:12 - 00:00:25] Sales Rep: Great today we're going to focus on how we automate post-demo follow-ups
-                [00:00:25 - 00:00:30] Prospect: My biggest pain point is the time spent summarizing
-                [00:00:30 - 00:00:45] Sales Rep: Exactly our key feature is the 'Instant Microsite Generation' let me show you that
-                """
-    ),
-    response_model=Transcription,
-)
+@lru_cache(maxsize=None)
+def get_transcription_agent():
+    """
+    Returns the shared transcription agent.
+
+    Built on first use so importing this module doesn't pull in agno or the Gemini client.
+    """
+    from agno.agent import Agent
+    from agno.models.google import Gemini
+
+    return Agent(
+        model=Gemini(id="gemini-2.0-flash-lite", response_modalities=["text"]),
+        description=dedent(
+            """\
+                    Highly accurate, verbatim audio-to-text transcription service.
+                    Converts spoken words into a detailed textual record, preserving crucial temporal context and speaker identification."""
+        ),
+        instructions=dedent(
+            """\
+                    Strictly follow these rules for verbatim transcription with timestamps and speaker identification.
+                    Output the transcription as a continuous string, with each segment on a new line.
+
+                    **Output Format:**
+                    [HH:MM:SS - HH:MM:SS] Speaker Name: Transcribed verbatim speech
+
+                    **Transcription Rules (Strictly Adhere to All):**
+
+                    1.  **Verbatim Accuracy:** Transcribe every single word exactly as heard.
+                    2.  **No Interpretation/Summarization:** Do not summarize, interpret, or rephrase speech. Transcribe only what is explicitly said.
+                    3.  **Unclear Speech:** Use '[inaudible]' for any speech that cannot be clearly understood.
+                    4.  **Pauses:** Indicate pauses longer than 2 seconds with '...' (three periods) directly within the transcribed text.
+                    5.  **No Punctuation/Formatting:** Do not add any punctuation (commas, periods, question marks, etc.) or apply any text formatting (bold, italics).
+                    6.  **Preserve Filler Words:** Include all filler words (e.g., 'um', 'uh', 'like', 'you know').
+
+                    **Example of Desired Output:**
+                    [00:00:00 - 00:00:05] Sales Rep: Good morning Jane thanks for joining the call
+                    [00:00:05 - 00:00:12] Prospect: Hi Alice excited to learn more about the Microsite Pilot
+                    [00:00:12 - 00:00:25] Sales Rep: Great today we're going to focus on how we automate post-demo follow-ups
+                    [00:00:25 - 00:00:30] Prospect: My biggest pain point is the time spent summarizing
+                    [00:00:30 - 00:00:45] Sales Rep: Exactly our key feature is the 'Instant Microsite Generation' let me show you that
+                    """
+        ),
+        response_model=Transcription,
+    )
+
+
+@lru_cache(maxsize=None)
+def get_compact_transcription_agent():
+    """
+    Returns the shared transcription agent for the compact transcript format, which
+    declares speakers once and gives each segment only its start offset in seconds.
+    Its output is expanded with `decode_compact_transcript`.
+    """
+    from agno.agent import Agent
+    from agno.models.google import Gemini
+
+    return Agent(
+        model=Gemini(id="gemini-2.0-flash-lite", response_modalities=["text"]),
+        description=dedent(
+            """\
+                    Highly accurate, verbatim audio-to-text transcription service.
+                    Converts spoken words into a compact textual record, preserving crucial temporal context and speaker identification."""
+        ),
+        instructions=dedent(
+            """\
+                    Strictly follow these rules for verbatim transcription with timestamps and speaker identification.
+                    Output the transcription as a continuous string, with each line on a new line.
+
+                    **Output Format:**
+                    First declare every speaker once, one per line, as: S<number>=Speaker Name
+                    Then one line per segment as: <start seconds> S<number> Transcribed verbatim speech
+                    Finally one line with the end of the last segment as: <end seconds> END
+                    Start and end times are whole seconds from the beginning of the recording.
+
+                    **Transcription Rules (Strictly Adhere to All):**
+
+                    1.  **Verbatim Accuracy:** Transcribe every single word exactly as heard.
+                    2.  **No Interpretation/Summarization:** Do not summarize, interpret, or rephrase speech. Transcribe only what is explicitly said.
+                    3.  **Unclear Speech:** Use '[inaudible]' for any speech that cannot be clearly understood.
+                    4.  **Pauses:** Indicate pauses longer than 2 seconds with '...' (three periods) directly within the transcribed text.
+                    5.  **No Punctuation/Formatting:** Do not add any punctuation (commas, periods, question marks, etc.) or apply any text formatting (bold, italics).
+                    6.  **Preserve Filler Words:** Include all filler words (e.g., 'um', 'uh', 'like', 'you know').
+                    7.  **Speaker Ids:** Never repeat speaker names on segment lines; always use the declared S<number> id.
+
+                    **Example of Desired Output:**
+                    S1=Sales Rep
+                    S2=Prospect
+                    0 S1 Good morning Jane thanks for joining the call
+                    5 S2 Hi Alice excited to learn more about the Microsite Pilot
+                    12 S1 Great today we're going to focus on how we automate post-demo follow-ups
+                    25 S2 My biggest pain point is the time spent summarizing
+                    30 S1 Exactly our key feature is the 'Instant Microsite Generation' let me show you that
+                    45 END
+                    """
+        ),
+        response_model=Transcription,
+    )
@@ -3,9 +3,18 @@ from pathlib import Path
 import asyncio
 from concurrent.futures import ThreadPoolExecutor
 import uuid
-from .workflow import MicroSiteGenerator
+from .utils.job_checkpoints import JobCheckpointStore
+from .utils.audio_processing import get_audio_pool
+from .utils.audio_probe import AudioRejected, admit_audio, probe_audio
+from .utils.job_scheduler import SchedulerFull, get_scheduler
+from .utils.netlify_deployment import flush_pending_deploys, is_deploy_pending
 from typing import Optional
 import datetime
+import logging
+import os
+import threading
+import time
+from dotenv import load_dotenv
 from fastapi.middleware.cors import CORSMiddleware
 
 app = FastAPI(
@@ -25,18 +34,86 @@ app.add_middleware(
 )
 
 
-workflow = MicroSiteGenerator()
 executor = ThreadPoolExecutor(max_workers=4)
-UPLOAD_DIR = Path("uploads")
-UPLOAD_DIR.mkdir(exist_ok=True)
+checkpoints = JobCheckpointStore()
+# Workflow jobs run through the scheduler (get_scheduler); the executor is left for short
+# background tasks
+
+# The workflow (and with it agno, the Gemini client and the agents) is built on first use
+_workflow = None
+_workflow_lock = threading.Lock()
+
+
+def get_workflow():
+    """Returns the shared MicroSiteGenerator, importing and building it on first call."""
+    global _workflow
+    with _workflow_lock:
+        if _workflow is None:
+            from .workflow import MicroSiteGenerator
+
+            _workflow = MicroSiteGenerator()
+            _workflow.checkpoints = checkpoints
+    return _workflow
+
+
+def warm_up():
+    """Builds the workflow, agents and model clients so the first request doesn't pay for it."""
+    start = time.perf_counter()
+    try:
+        get_workflow().warm_up()
+        print(f"Warm-up completed in {time.perf_counter() - start:.2f}s")
+    except Exception as e:
+        print(f"Warm-up failed: {e}")
+
+
+@app.on_event("startup")
+async def load_environment():
+    """Load settings from .env before anything reads them."""
+    load_dotenv()
+
+
+@app.on_event("startup")
+async def configure_logging():
+    """
+    Emit the package's log records (e.g. per-stage memory reports) at LOG_LEVEL (default
+    INFO), unless logging has already been configured for it.
+    """
+    package_logger = logging.getLogger("micrositepilot")
+    if not package_logger.handlers:
+        handler = logging.StreamHandler()
+        handler.setFormatter(
+            logging.Formatter("%(asctime)s %(levelname)s %(name)s: %(message)s")
+        )
+        package_logger.addHandler(handler)
+        package_logger.setLevel(os.getenv("LOG_LEVEL", "INFO").upper())
+
+
+@app.on_event("startup")
+async def schedule_warm_up():
+    """
+    Optionally warm up the agents when WARMUP_ON_STARTUP=true. The warm-up isn't awaited,
+    so startup completes and the server starts listening while it runs in the executor.
+    """
+    if os.getenv("WARMUP_ON_STARTUP", "false").lower() == "true":
+        asyncio.get_event_loop().run_in_executor(executor, warm_up)
+
+
+@app.on_event("startup")
+async def purge_expired_checkpoints():
+    """Garbage-collect job checkpoints older than CHECKPOINT_MAX_AGE_HOURS."""
+    removed = _purge_expired_checkpoints()
+    if removed:
+        print(f"Purged checkpoints for {removed} expired job(s)")
 
 
 @app.get("/")
 async def health_check():
     """Health check endpoint to verify application status."""
     try:
-        # Check if upload directory exists and is writable
-        upload_dir_status = UPLOAD_DIR.exists() and UPLOAD_DIR.is_dir()
+        # Uploads are kept in the checkpoint store, whose directory is created on first use
+        checkpoint_dir_status = (
+            not checkpoints.root.exists() or checkpoints.root.is_dir()
+        )
 
         return {
             "status": "healthy",
@@ -44,8 +121,12 @@ async def health_check():
             "version": "1.0.0",
             "services": {
                 "workflow": "operational",
-                "upload_directory": "operational" if upload_dir_status else "error",
+                "checkpoint_directory": (
+                    "operational" if checkpoint_dir_status else "error"
+                ),
                 "executor": "operational" if executor else "error",
+                "audio_pool": get_audio_pool().metrics(),
+                "scheduler": get_scheduler().metrics(),
             },
             "uptime": "running",
         }
@@ -60,30 +141,77 @@ async def health_check():
         )
 
 
-@app.post("/transcribe")
-async def transcribe_and_deploy_microsite(
-    file: UploadFile, format: Optional[str] = None
-):
-    """Endpoint for audio file upload, transcription, microsite generation, and Netlify deployment."""
-    temp_path = None
-    try:
-        if not file.content_type.startswith("audio/"):
+@app.on_event("shutdown")
+def shutdown_workers():
+    """Publish pending microsites, then stop the job scheduler and audio worker processes."""
+    flush_pending_deploys()
+    get_scheduler().shutdown()
+    get_audio_pool().shutdown(wait=False)
+
+
+# Jobs queued or running. A job is released when its workflow finishes, not when the
+# request ends, so a client that gave up waiting can't start a second run of it
+_active_jobs = set()
+_active_jobs_lock = threading.Lock()
+
+
+def _claim_job(job_id: str) -> None:
+    with _active_jobs_lock:
+        if job_id in _active_jobs:
             raise HTTPException(
-                status_code=400, detail="Only audio files are supported"
+                status_code=409,
+                detail={
+                    "status": "error",
+                    "message": f"Job {job_id} is already running. Check GET /jobs/{job_id} for progress.",
+                    "job_id": job_id,
+                },
             )
+        _active_jobs.add(job_id)
+
+
+def _release_job(job_id: str) -> None:
+    with _active_jobs_lock:
+        _active_jobs.discard(job_id)
+
+
+def _purge_expired_checkpoints() -> int:
+    # Held throughout, so a job can't be claimed for a retry while its checkpoints are removed
+    with _active_jobs_lock:
+        return checkpoints.purge_expired(exclude=_active_jobs)
+
+
+def _parse_job_id(job_id: str) -> str:
+    """Job ids are UUIDs; reject anything else before it touches the filesystem."""
+    try:
+        return str(uuid.UUID(job_id))
+    except ValueError:
+        raise HTTPException(status_code=404, detail=f"Job {job_id} not found")
 
-        temp_path = UPLOAD_DIR / f"{uuid.uuid4()}_{file.filename}"
-        with temp_path.open("wb") as buffer:
-            buffer.write(await file.read())
 
-        audio_format_to_use = format or file.filename.split(".")[-1]
+def _check_lane(lane: str) -> str:
+    lanes = get_scheduler().lane_penalties
+    if lane not in lanes:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unknown lane '{lane}', expected one of: {', '.join(lanes)}",
+        )
+    return lane
 
+
+async def _run_job(
+    job_id: str, audio_path: Path, audio_format: str, audio_info: dict, lane: str
+):
+    """Schedules the workflow for a job, waits for it and formats the API response."""
+    _claim_job(job_id)
+    try:
         # Define a function to run the workflow and consume the generator
         def run_workflow():
             responses = list(
-                workflow.run(
-                    audio_source=str(temp_path),
-                    audio_format=audio_format_to_use,
+                get_workflow().run(
+                    audio_source=str(audio_path),
+                    audio_format=audio_format,
+                    job_id=job_id,
+                    normalize_audio=audio_info.get("route") == "normalize",
                 )
             )
             if responses:
@@ -92,16 +220,51 @@ async def transcribe_and_deploy_microsite(
                 return final_response
             return None
 
-        deployment_result = await asyncio.get_event_loop().run_in_executor(
-            executor, run_workflow
-        )
+        try:
+            # Shorter recordings are scheduled first, ordered by their estimated processing time
+            future = get_scheduler().submit(
+                run_workflow,
+                cost_seconds=audio_info.get("estimated_processing_seconds", 0.0),
+                lane=lane,
+            )
+        except SchedulerFull as e:
+            _release_job(job_id)
+            raise HTTPException(
+                status_code=429,
+                detail={
+                    "status": "error",
+                    "message": f"Server is busy: {e}. Retry later via POST /jobs/{job_id}/retry.",
+                    "job_id": job_id,
+                    "workflow_completed": False,
+                },
+                headers={"Retry-After": str(e.retry_after)},
+            )
+        except BaseException:
+            _release_job(job_id)
+            raise
+        future.add_done_callback(lambda _: _release_job(job_id))
+        deployment_result = await asyncio.wrap_future(future)
 
+        memory = (checkpoints.load_job(job_id) or {}).get("memory")
         if deployment_result:
             # Format the response to include both deployment and workflow information
-            if isinstance(deployment_result, dict) and deployment_result.get("success"):
+            if isinstance(deployment_result, dict) and deployment_result.get("pending"):
+                return {
+                    "status": "pending",
+                    "message": f"Microsite generated and queued for deployment. GET /jobs/{job_id} reports the URL once it is deployed",
+                    "job_id": job_id,
+                    "audio": audio_info,
+                    "memory": memory,
+                    "deployment": deployment_result,
+                    "workflow_completed": True,
+                }
+            elif isinstance(deployment_result, dict) and deployment_result.get("success"):
                 return {
                     "status": "success",
                     "message": "Audio successfully transcribed, microsite generated, and deployed to Netlify",
+                    "job_id": job_id,
+                    "audio": audio_info,
+                    "memory": memory,
                     "deployment": deployment_result,
                     "workflow_completed": True,
                 }
@@ -109,6 +272,9 @@ async def transcribe_and_deploy_microsite(
                 return {
                     "status": "partial_success",
                     "message": "Workflow completed but deployment may have failed",
+                    "job_id": job_id,
+                    "audio": audio_info,
+                    "memory": memory,
                     "deployment": deployment_result,
                     "workflow_completed": True,
                 }
@@ -118,6 +284,7 @@ async def transcribe_and_deploy_microsite(
                 detail={
                     "status": "error",
                     "message": "Workflow failed: No responses returned from transcription and deployment process.",
+                    "job_id": job_id,
                     "workflow_completed": False,
                 },
             )
@@ -125,7 +292,7 @@ async def transcribe_and_deploy_microsite(
     except HTTPException:
         raise
     except Exception as e:
-        print(f"Error in /transcribe: {e}")
+        print(f"Error in job {job_id}: {e}")
         import traceback
 
         traceback.print_exc()
@@ -134,9 +301,76 @@ async def transcribe_and_deploy_microsite(
             detail={
                 "status": "error",
                 "message": f"Transcription and deployment workflow failed: {str(e)}",
+                "job_id": job_id,
+                "resume_stage": checkpoints.first_pending_stage(job_id),
                 "workflow_completed": False,
             },
         )
-    finally:
-        if temp_path and temp_path.exists():
-            temp_path.unlink(missing_ok=True)
+
+
+@app.post("/transcribe")
+async def transcribe_and_deploy_microsite(
+    file: UploadFile, format: Optional[str] = None, lane: str = "interactive"
+):
+    """Endpoint for audio file upload, transcription, microsite generation, and Netlify deployment."""
+    _check_lane(lane)
+    # Probe the container header before reading the upload, so corrupt, mislabelled or
+    # over-long files are rejected before any transcription is paid for
+    try:
+        probe = probe_audio(file.file)
+        admission = admit_audio(probe)
+    except AudioRejected as e:
+        raise HTTPException(
+            status_code=413 if e.reason in ("too_long", "too_large") else 400,
+            detail={"status": "error", "message": str(e), "reason": e.reason},
+        )
+
+    if format and format != probe.format:
+        print(f"Requested format '{format}' doesn't match detected format '{probe.format}'")
+    audio_info = {**probe.model_dump(), **admission.model_dump()}
+
+    _purge_expired_checkpoints()
+    # The upload is kept with the job's checkpoints so a failed job can be retried
+    job_id = str(uuid.uuid4())
+    audio_path = checkpoints.save_audio(
+        job_id, await file.read(), probe.format, metadata={"audio": audio_info}
+    )
+
+    return await _run_job(job_id, audio_path, probe.format, audio_info, lane)
+
+
+@app.get("/jobs/{job_id}")
+async def get_job_status(job_id: str):
+    """Reports a job's completed stages, audio details and memory use."""
+    job_id = _parse_job_id(job_id)
+    job = checkpoints.load_job(job_id) if checkpoints.exists(job_id) else None
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Job {job_id} not found")
+
+    resume_stage = checkpoints.first_pending_stage(job_id)
+    return {
+        "job_id": job_id,
+        "completed": resume_stage is None,
+        "running": job_id in _active_jobs,
+        "completed_stages": checkpoints.completed_stages(job_id),
+        "resume_stage": resume_stage,
+        "audio": job.get("audio"),
+        "memory": job.get("memory"),
+        "deployment_pending": is_deploy_pending(job_id),
+        "deployment": checkpoints.load_stage(job_id, "deployment"),
+    }
+
+
+@app.post("/jobs/{job_id}/retry")
+async def retry_job(job_id: str, lane: str = "interactive"):
+    """Resumes a job from the first stage that didn't complete."""
+    _check_lane(lane)
+    job_id = _parse_job_id(job_id)
+    audio = checkpoints.get_audio(job_id) if checkpoints.exists(job_id) else None
+    if not audio:
+        raise HTTPException(status_code=404, detail=f"Job {job_id} not found")
+
+    audio_path, audio_format = audio
+    audio_info = checkpoints.load_job(job_id).get("audio", {})
+    print(f"Retrying job {job_id} from stage: {checkpoints.first_pending_stage(job_id)}")
+    return await _run_job(job_id, audio_path, audio_format, audio_info, lane)
@@ -0,0 +1,418 @@
+import os
+import struct
+from pathlib import Path
+from typing import BinaryIO, Optional, Union
+from pydantic import BaseModel, Field
+
+
+# Formats the transcription model accepts as-is. Anything else is routed through normalization.
+NATIVE_FORMATS = {"wav", "mp3", "aiff", "aac", "ogg", "flac"}
+
+MPEG_BITRATES = {
+    # (version is MPEG1, layer) -> kbps by bitrate index
+    (True, 1): [0, 32, 64, 96, 128, 160, 192, 224, 256, 288, 320, 352, 384, 416, 448],
+    (True, 2): [0, 32, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320, 384],
+    (True, 3): [0, 32, 40, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320],
+    (False, 1): [0, 32, 48, 56, 64, 80, 96, 112, 128, 144, 160, 176, 192, 224, 256],
+    (False, 2): [0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160],
+    (False, 3): [0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160],
+}
+MPEG_SAMPLE_RATES = {3: [44100, 48000, 32000], 2: [22050, 24000, 16000], 0: [11025, 12000, 8000]}
+ADTS_SAMPLE_RATES = [96000, 88200, 64000, 48000, 44100, 32000, 24000, 22050, 16000, 12000, 11025, 8000, 7350]
+
+# How far into the file to look for the first MPEG/ADTS frame (skips junk and padding)
+SYNC_SEARCH_BYTES = 64 * 1024
+
+
+class AudioProbe(BaseModel):
+    format: str = Field(..., description="Container/codec format detected from the file header.")
+    duration_seconds: float = Field(..., description="Audio duration in seconds.")
+    sample_rate: int = Field(..., description="Sample rate in Hz.")
+    channels: int = Field(..., description="Number of audio channels.")
+    file_size: int = Field(..., description="File size in bytes.")
+
+
+class AudioAdmission(BaseModel):
+    route: str = Field(
+        ...,
+        description="'direct' to send the audio as-is, 'normalize' to re-encode it first.",
+    )
+    estimated_processing_seconds: float = Field(
+        ..., description="Estimated end-to-end processing time for the job."
+    )
+
+
+class AudioRejected(ValueError):
+    """
+    Raised when an audio file fails probing or the configured limits.
+
+    `reason` is one of 'unsupported', 'too_short', 'too_long' or 'too_large'.
+    """
+
+    def __init__(self, message: str, reason: str):
+        super().__init__(message)
+        self.reason = reason
+
+
+# --- Header Parsers ---
+# Each parser reads only the headers it needs and returns (duration, sample_rate, channels).
+
+
+def _read_at(f: BinaryIO, offset: int, size: int) -> bytes:
+    f.seek(offset)
+    return f.read(size)
+
+
+def _probe_wav(f: BinaryIO, file_size: int):
+    offset, fmt = 12, None
+    while offset + 8 <= file_size:
+        chunk_id, chunk_size = struct.unpack("<4sI", _read_at(f, offset, 8))
+        if chunk_id == b"fmt ":
+            fmt = struct.unpack("<HHIIHH", f.read(16))
+        elif chunk_id == b"data" and fmt:
+            _, channels, sample_rate, byte_rate, _, _ = fmt
+            # Streamed WAVs can leave the data size unset; fall back to the rest of the file
+            data_size = min(chunk_size, file_size - offset - 8)
+            return data_size / byte_rate, sample_rate, channels
+        offset += 8 + chunk_size + (chunk_size & 1)
+    raise AudioRejected("WAV file has no fmt/data chunk", "unsupported")
+
+
+def _probe_aiff(f: BinaryIO, file_size: int):
+    offset = 12
+    while offset + 8 <= file_size:
+        chunk_id, chunk_size = struct.unpack(">4sI", _read_at(f, offset, 8))
+        if chunk_id == b"COMM":
+            channels, frames, _ = struct.unpack(">HIH", f.read(8))
+            # The sample rate is an 80-bit IEEE 754 extended float
+            extended = f.read(10)
+            exponent = struct.unpack(">H", extended[:2])[0] & 0x7FFF
+            mantissa = int.from_bytes(extended[2:], "big")
+            sample_rate = round(mantissa * 2.0 ** (exponent - 16383 - 63))
+            return frames / sample_rate, sample_rate, channels
+        offset += 8 + chunk_size + (chunk_size & 1)
+    raise AudioRejected("AIFF file has no COMM chunk", "unsupported")
+
+
+def _probe_flac(f: BinaryIO, file_size: int):
+    block_header = _read_at(f, 4, 4)
+    if block_header[0] & 0x7F != 0:
+        raise AudioRejected("FLAC file doesn't start with STREAMINFO", "unsupported")
+    info = int.from_bytes(_read_at(f, 8 + 10, 8), "big")
+    sample_rate = info >> 44
+    channels = ((info >> 41) & 0x7) + 1
+    total_samples = info & 0xFFFFFFFFF
+    return total_samples / sample_rate, sample_rate, channels
+
+
+def _probe_ogg(f: BinaryIO, file_size: int):
+    page_segments = _read_at(f, 26, 1)[0]
+    packet = _read_at(f, 27 + page_segments, 19)
+    if packet.startswith(b"\x01vorbis"):
+        channels = packet[11]
+        sample_rate = granule_rate = struct.unpack("<I", packet[12:16])[0]
+        pre_skip = 0
+    elif packet.startswith(b"OpusHead"):
+        channels = packet[9]
+        pre_skip = struct.unpack("<H", packet[10:12])[0]
+        sample_rate = struct.unpack("<I", packet[12:16])[0] or 48000
+        granule_rate = 48000
+    else:
+        raise AudioRejected("Unsupported Ogg codec", "unsupported")
+
+    # The last page's granule position is the total sample count
+    tail_size = min(file_size, 64 * 1024)
+    tail = _read_at(f, file_size - tail_size, tail_size)
+    last_page = tail.rfind(b"OggS")
+    if last_page < 0 or last_page + 14 > len(tail):
+        raise AudioRejected("Ogg file is truncated", "unsupported")
+    granule = struct.unpack("<q", tail[last_page + 6 : last_page + 14])[0]
+    return max(granule - pre_skip, 0) / granule_rate, sample_rate, channels
+
+
+def _parse_mpeg_header(header: bytes):
+    """Returns (frame_length, bitrate, sample_rate, channels, samples_per_frame, is_mpeg1) or None."""
+    h = struct.unpack(">I", header)[0]
+    version, layer_bits = (h >> 19) & 3, (h >> 17) & 3
+    bitrate_index, rate_index = (h >> 12) & 0xF, (h >> 10) & 3
+    if (h >> 21) != 0x7FF or version == 1 or layer_bits == 0:
+        return None
+    if bitrate_index in (0, 15) or rate_index == 3:
+        return None
+
+    layer = 4 - layer_bits
+    is_mpeg1 = version == 3
+    bitrate = MPEG_BITRATES[(is_mpeg1, layer)][bitrate_index] * 1000
+    sample_rate = MPEG_SAMPLE_RATES[version][rate_index]
+    padding = (h >> 9) & 1
+    channels = 1 if (h >> 6) & 3 == 3 else 2
+
+    if layer == 1:
+        frame_length = (12 * bitrate // sample_rate + padding) * 4
+        return frame_length, bitrate, sample_rate, channels, 384, is_mpeg1
+    samples = 1152 if layer == 2 or is_mpeg1 else 576
+    frame_length = samples // 8 * bitrate // sample_rate + padding
+    return frame_length, bitrate, sample_rate, channels, samples, is_mpeg1
+
+
+def _skip_id3(f: BinaryIO) -> int:
+    header = _read_at(f, 0, 10)
+    if not header.startswith(b"ID3"):
+        return 0
+    size = 0
+    for b in header[6:10]:
+        size = (size << 7) | (b & 0x7F)
+    footer = 10 if header[5] & 0x10 else 0
+    return 10 + size + footer
+
+
+def _probe_mp3(f: BinaryIO, file_size: int):
+    start = _skip_id3(f)
+    window = _read_at(f, start, SYNC_SEARCH_BYTES)
+    for i in range(len(window) - 4):
+        if window[i] != 0xFF or window[i + 1] & 0xE0 != 0xE0:
+            continue
+        frame = _parse_mpeg_header(window[i : i + 4])
+        if not frame:
+            continue
+        frame_length, bitrate, sample_rate, channels, samples, is_mpeg1 = frame
+        # Require a second frame right after the first to avoid false syncs
+        next_header = _read_at(f, start + i + frame_length, 4)
+        if len(next_header) == 4 and not _parse_mpeg_header(next_header):
+            continue
+        audio_start = start + i
+        break
+    else:
+        raise AudioRejected("No MPEG audio frames found", "unsupported")
+
+    # VBR files carry the frame count in a Xing/Info or VBRI header in the first frame
+    side_info = (32 if channels == 2 else 17) if is_mpeg1 else (17 if channels == 2 else 9)
+    first_frame = _read_at(f, audio_start, 4 + max(side_info, 32) + 18)
+    xing = first_frame[4 + side_info : 4 + side_info + 12]
+    vbri = first_frame[36:54]
+    frame_count = None
+    if xing[:4] in (b"Xing", b"Info") and struct.unpack(">I", xing[4:8])[0] & 1:
+        frame_count = struct.unpack(">I", xing[8:12])[0]
+    elif vbri[:4] == b"VBRI":
+        frame_count = struct.unpack(">I", vbri[14:18])[0]
+    if frame_count:
+        return frame_count * samples / sample_rate, sample_rate, channels
+
+    # CBR: the audio size divided by the bitrate
+    audio_size = file_size - audio_start
+    if _read_at(f, file_size - 128, 3) == b"TAG":
+        audio_size -= 128
+    return audio_size * 8 / bitrate, sample_rate, channels
+
+
+def _probe_adts(f: BinaryIO, file_size: int):
+    header = _read_at(f, 0, 7)
+    rate_index = (header[2] >> 2) & 0xF
+    if rate_index >= len(ADTS_SAMPLE_RATES):
+        raise AudioRejected("Invalid ADTS sample rate", "unsupported")
+    sample_rate = ADTS_SAMPLE_RATES[rate_index]
+    channels = ((header[2] & 1) << 2) | (header[3] >> 6)
+
+    # Estimate the frame count from the average length of the first frames
+    offset, frames = 0, 0
+    while frames < 256 and offset + 7 <= file_size:
+        header = _read_at(f, offset, 7)
+        if len(header) < 7 or header[0] != 0xFF or header[1] & 0xF6 != 0xF0:
+            break
+        frame_length = ((header[3] & 3) << 11) | (header[4] << 3) | (header[5] >> 5)
+        if frame_length < 7:
+            break
+        offset += frame_length
+        frames += 1
+    if not frames:
+        raise AudioRejected("No ADTS frames found", "unsupported")
+    total_frames = file_size / (offset / frames)
+    return total_frames * 1024 / sample_rate, sample_rate, channels
+
+
+def _iter_boxes(f: BinaryIO, start: int, end: int):
+    offset = start
+    while offset + 8 <= end:
+        size, box_type = struct.unpack(">I4s", _read_at(f, offset, 8))
+        header_size = 8
+        if size == 1:
+            size = struct.unpack(">Q", f.read(8))[0]
+            header_size = 16
+        elif size == 0:
+            size = end - offset
+        if size < header_size:
+            return
+        yield box_type, offset + header_size, offset + size
+        offset += size
+
+
+def _find_box(f: BinaryIO, start: int, end: int, box_type: bytes):
+    for found_type, body_start, body_end in _iter_boxes(f, start, end):
+        if found_type == box_type:
+            return body_start, body_end
+    return None
+
+
+def _probe_mp4(f: BinaryIO, file_size: int):
+    moov = _find_box(f, 0, file_size, b"moov")
+    if not moov:
+        raise AudioRejected("MP4 file has no moov box", "unsupported")
+    for box_type, trak_start, trak_end in _iter_boxes(f, *moov):
+        if box_type != b"trak":
+            continue
+        mdia = _find_box(f, trak_start, trak_end, b"mdia")
+        hdlr = mdia and _find_box(f, *mdia, b"hdlr")
+        if not hdlr or _read_at(f, hdlr[0] + 8, 4) != b"soun":
+            continue
+
+        mdhd = _find_box(f, *mdia, b"mdhd")
+        version = _read_at(f, mdhd[0], 1)[0]
+        if version == 1:
+            timescale, duration = struct.unpack(">IQ", _read_at(f, mdhd[0] + 20, 12))
+        else:
+            timescale, duration = struct.unpack(">II", _read_at(f, mdhd[0] + 12, 8))
+
+        stsd = None
+        minf = _find_box(f, *mdia, b"minf")
+        stbl = minf and _find_box(f, *minf, b"stbl")
+        stsd = stbl and _find_box(f, *stbl, b"stsd")
+        if not stsd:
+            break
+        # First sample entry: 8-byte box header, then the AudioSampleEntry fields
+        entry = _read_at(f, stsd[0] + 8, 36)
+        channels = struct.unpack(">H", entry[24:26])[0]
+        sample_rate = struct.unpack(">I", entry[32:36])[0] >> 16
+        return duration / timescale, sample_rate, channels
+    raise AudioRejected("MP4 file has no audio track", "unsupported")
+
+
+def _detect_format(header: bytes) -> Optional[str]:
+    if header[:4] == b"RIFF" and header[8:12] == b"WAVE":
+        return "wav"
+    if header[:4] == b"FORM" and header[8:12] in (b"AIFF", b"AIFC"):
+        return "aiff"
+    if header[:4] == b"fLaC":
+        return "flac"
+    if header[:4] == b"OggS":
+        return "ogg"
+    if header[4:8] == b"ftyp":
+        return "m4a"
+    if header[:3] == b"ID3":
+        return "mp3"
+    if len(header) >= 2 and header[0] == 0xFF:
+        if header[1] & 0xF6 == 0xF0:
+            return "aac"
+        if header[1] & 0xE0 == 0xE0:
+            return "mp3"
+    return None
+
+
+PROBES = {
+    "wav": _probe_wav,
+    "aiff": _probe_aiff,
+    "flac": _probe_flac,
+    "ogg": _probe_ogg,
+    "m4a": _probe_mp4,
+    "mp3": _probe_mp3,
+    "aac": _probe_adts,
+}
+
+
+def probe_audio(source: Union[str, Path, BinaryIO]) -> AudioProbe:
+    """
+    Detect the real format, duration, sample rate and channels of an audio file by reading
+    only its magic bytes and container headers, without decoding the audio.
+
+    Args:
+        source: A file path, or a seekable binary file object (its position is restored)
+
+    Returns:
+        AudioProbe: The detected audio properties
+
+    Raises:
+        AudioRejected: If the file isn't a recognised audio format or its headers are corrupt
+    """
+    if isinstance(source, (str, Path)):
+        with open(source, "rb") as f:
+            return probe_audio(f)
+
+    f = source
+    position = f.tell()
+    try:
+        file_size = f.seek(0, os.SEEK_END)
+        header = _read_at(f, 0, 12)
+        audio_format = _detect_format(header)
+        if not audio_format:
+            raise AudioRejected("Unrecognised audio format", "unsupported")
+        try:
+            duration, sample_rate, channels = PROBES[audio_format](f, file_size)
+        except (
+            struct.error, IndexError, TypeError, ValueError, ZeroDivisionError, OverflowError
+        ) as e:
+            raise AudioRejected(f"Corrupt {audio_format} header: {e}", "unsupported")
+        if duration <= 0 or sample_rate <= 0 or channels <= 0:
+            raise AudioRejected(f"Corrupt {audio_format} header", "unsupported")
+        return AudioProbe(
+            format=audio_format,
+            duration_seconds=round(duration, 3),
+            sample_rate=sample_rate,
+            channels=channels,
+            file_size=file_size,
+        )
+    finally:
+        f.seek(position)
+
+
+def admit_audio(probe: AudioProbe) -> AudioAdmission:
+    """
+    Check a probed file against the configured limits and decide how to route it.
+
+    Limits (environment variables):
+        AUDIO_MIN_DURATION_SECONDS: Shortest accepted recording (default 1)
+        AUDIO_MAX_DURATION_SECONDS: Longest accepted recording (default 10800, i.e. 3 hours)
+        AUDIO_MAX_FILE_MB: Largest accepted upload (default 500)
+        AUDIO_NORMALIZE_ABOVE_MB: Files larger than this are re-encoded first (default 20)
+
+    Raises:
+        AudioRejected: If the file is outside the limits
+    """
+    min_duration = float(os.getenv("AUDIO_MIN_DURATION_SECONDS", "1"))
+    max_duration = float(os.getenv("AUDIO_MAX_DURATION_SECONDS", "10800"))
+    max_bytes = float(os.getenv("AUDIO_MAX_FILE_MB", "500")) * 1024 * 1024
+    normalize_above = float(os.getenv("AUDIO_NORMALIZE_ABOVE_MB", "20")) * 1024 * 1024
+
+    if probe.file_size > max_bytes:
+        raise AudioRejected(
+            f"Audio file is {probe.file_size / 1024 / 1024:.0f} MB, the limit is {max_bytes / 1024 / 1024:.0f} MB",
+            "too_large",
+        )
+    if probe.duration_seconds > max_duration:
+        raise AudioRejected(
+            f"Audio is {probe.duration_seconds / 60:.1f} minutes long, the limit is {max_duration / 60:.1f} minutes",
+            "too_long",
+        )
+    if probe.duration_seconds < min_duration:
+        raise AudioRejected(
+            f"Audio is {probe.duration_seconds:.1f} seconds long, the minimum is {min_duration:.0f} seconds",
+            "too_short",
+        )
+
+    route = (
+        "normalize"
+        if probe.format not in NATIVE_FORMATS or probe.file_size > normalize_above
+        else "direct"
+    )
+    return AudioAdmission(
+        route=route, estimated_processing_seconds=estimate_processing_seconds(probe)
+    )
+
+
+def estimate_processing_seconds(probe: AudioProbe) -> float:
+    """
+    Linear estimate of end-to-end job time from the audio duration. The rate and fixed
+    overhead are configurable through PROCESSING_SECONDS_PER_AUDIO_MINUTE (default 3)
+    and PROCESSING_OVERHEAD_SECONDS (default 30).
+    """
+    per_minute = float(os.getenv("PROCESSING_SECONDS_PER_AUDIO_MINUTE", "3"))
+    overhead = float(os.getenv("PROCESSING_OVERHEAD_SECONDS", "30"))
+    return round(overhead + probe.duration_seconds / 60 * per_minute, 1)
@@ -0,0 +1,233 @@
+import os
+import time
+import tempfile
+import threading
+import multiprocessing
+from concurrent.futures import CancelledError, Future, ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Union
+
+
+class AudioPoolFull(Exception):
+    """Raised when the audio worker pool already has `max_pending` tasks in flight."""
+
+
+# --- Worker functions ---
+# These run in the worker processes. Audio is passed by file path and results are
+# written to files, so only short strings cross the process boundary.
+
+
+def _transcode(
+    input_path: str,
+    output_path: str,
+    output_format: str,
+    sample_rate: Optional[int] = None,
+    channels: Optional[int] = None,
+) -> str:
+    from pydub import AudioSegment
+
+    audio = AudioSegment.from_file(input_path)
+    if sample_rate:
+        audio = audio.set_frame_rate(sample_rate)
+    if channels:
+        audio = audio.set_channels(channels)
+    audio.export(output_path, format=output_format)
+    return output_path
+
+
+def _split(
+    input_path: str, output_dir: str, chunk_seconds: float, output_format: str
+) -> List[str]:
+    from pydub import AudioSegment
+
+    audio = AudioSegment.from_file(input_path)
+    chunk_ms = int(chunk_seconds * 1000)
+    output_paths = []
+    for index, start in enumerate(range(0, len(audio), chunk_ms)):
+        output_path = str(Path(output_dir) / f"chunk_{index:04d}.{output_format}")
+        audio[start : start + chunk_ms].export(output_path, format=output_format)
+        output_paths.append(output_path)
+    return output_paths
+
+
+def _timed_call(fn: Callable, args: tuple) -> Dict[str, Any]:
+    started_at = time.time()
+    result = fn(*args)
+    return {"result": result, "started_at": started_at, "finished_at": time.time()}
+
+
+class AudioWorkerPool:
+    """
+    Runs CPU-bound audio work (decoding, resampling, splitting, re-encoding) in separate
+    processes so it neither holds the GIL nor competes with the API event loop.
+    """
+
+    def __init__(self, max_workers: Optional[int] = None, max_pending: Optional[int] = None):
+        self.max_workers = max_workers or int(
+            os.getenv("AUDIO_WORKERS", str(os.cpu_count() or 1))
+        )
+        self.max_pending = max_pending or int(os.getenv("AUDIO_MAX_PENDING", "16"))
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        self._stats = {
+            "submitted": 0,
+            "completed": 0,
+            "failed": 0,
+            "rejected": 0,
+            "queue_wait_seconds": 0.0,
+            "run_seconds": 0.0,
+        }
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            # Spawned workers don't inherit the server's threads or locks
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return self._executor
+
+    def _submit(self, fn: Callable, *args) -> Future:
+        with self._lock:
+            if self._in_flight >= self.max_pending:
+                self._stats["rejected"] += 1
+                raise AudioPoolFull(
+                    f"Audio worker pool is full ({self.max_pending} tasks pending)"
+                )
+            self._in_flight += 1
+            self._stats["submitted"] += 1
+            executor = self._get_executor()
+
+        submitted_at = time.time()
+        try:
+            timed_future = executor.submit(_timed_call, fn, args)
+        except Exception:
+            with self._lock:
+                self._in_flight -= 1
+                self._stats["failed"] += 1
+            raise
+        result_future: Future = Future()
+
+        def on_done(done: Future):
+            error = CancelledError() if done.cancelled() else done.exception()
+            with self._lock:
+                self._in_flight -= 1
+                if error is None:
+                    timing = done.result()
+                    self._stats["completed"] += 1
+                    self._stats["queue_wait_seconds"] += timing["started_at"] - submitted_at
+                    self._stats["run_seconds"] += timing["finished_at"] - timing["started_at"]
+                else:
+                    self._stats["failed"] += 1
+            if error is None:
+                result_future.set_result(done.result()["result"])
+            else:
+                result_future.set_exception(error)
+
+        timed_future.add_done_callback(on_done)
+        return result_future
+
+    def submit_transcode(
+        self,
+        input_path: Union[str, Path],
+        output_format: str = "mp3",
+        sample_rate: Optional[int] = None,
+        channels: Optional[int] = None,
+        output_path: Optional[Union[str, Path]] = None,
+    ) -> Future:
+        """
+        Decode an audio file and re-encode it, optionally resampling and downmixing.
+
+        Args:
+            input_path: Path of the source audio file
+            output_format: Format to encode to (e.g. 'mp3', 'wav')
+            sample_rate: Target sample rate in Hz, or None to keep the original
+            channels: Target channel count, or None to keep the original
+            output_path: Where to write the result (a new temp file if not provided)
+
+        Returns:
+            Future: Resolves to the path of the encoded file, which the caller must delete
+        """
+        owns_output = output_path is None
+        if owns_output:
+            fd, output_path = tempfile.mkstemp(suffix=f".{output_format}")
+            os.close(fd)
+        try:
+            future = self._submit(
+                _transcode,
+                str(input_path),
+                str(output_path),
+                output_format,
+                sample_rate,
+                channels,
+            )
+        except Exception:
+            if owns_output:
+                Path(output_path).unlink(missing_ok=True)
+            raise
+
+        if owns_output:
+            # Don't leave the temp file behind if encoding fails
+            future.add_done_callback(
+                lambda f: f.exception() and Path(output_path).unlink(missing_ok=True)
+            )
+        return future
+
+    def submit_split(
+        self,
+        input_path: Union[str, Path],
+        chunk_seconds: float,
+        output_format: str = "mp3",
+        output_dir: Optional[Union[str, Path]] = None,
+    ) -> Future:
+        """
+        Split an audio file into consecutive chunks of `chunk_seconds`.
+
+        Returns:
+            Future: Resolves to the list of chunk file paths, in order
+        """
+        output_dir = output_dir or tempfile.mkdtemp(prefix="audio_chunks_")
+        return self._submit(
+            _split, str(input_path), str(output_dir), chunk_seconds, output_format
+        )
+
+    def metrics(self) -> Dict[str, Any]:
+        """Returns queue and throughput metrics for the pool."""
+        with self._lock:
+            completed = self._stats["completed"]
+            return {
+                "max_workers": self.max_workers,
+                "max_pending": self.max_pending,
+                "in_flight": self._in_flight,
+                "queued": max(0, self._in_flight - self.max_workers),
+                "submitted": self._stats["submitted"],
+                "completed": completed,
+                "failed": self._stats["failed"],
+                "rejected": self._stats["rejected"],
+                "avg_queue_wait_ms": (
+                    self._stats["queue_wait_seconds"] / completed * 1000 if completed else 0.0
+                ),
+                "avg_run_ms": (
+                    self._stats["run_seconds"] / completed * 1000 if completed else 0.0
+                ),
+            }
+
+    def shutdown(self, wait: bool = True) -> None:
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=wait, cancel_futures=True)
+                self._executor = None
+
+
+_audio_pool: Optional[AudioWorkerPool] = None
+_audio_pool_lock = threading.Lock()
+
+
+def get_audio_pool() -> AudioWorkerPool:
+    """Returns the shared audio worker pool. Worker processes start on first submission."""
+    global _audio_pool
+    with _audio_pool_lock:
+        if _audio_pool is None:
+            _audio_pool = AudioWorkerPool()
+    return _audio_pool
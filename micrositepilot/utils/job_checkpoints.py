@@ -0,0 +1,165 @@
+import os
+import json
+import time
+import shutil
+from pathlib import Path
+from typing import Any, Iterable, List, Optional, Tuple
+
+# Ordered stages of a microsite job. A job resumes from the first stage without a checkpoint.
+STAGES = ("transcription", "extraction", "html", "deployment")
+
+
+class JobCheckpointStore:
+    """
+    Stores the uploaded audio and every completed stage output of a job on local disk,
+    under `<root>/<job_id>/`, so a failed job can be resumed without starting over.
+    """
+
+    def __init__(self, root: Optional[Path] = None):
+        self._root = Path(root) if root else None
+
+    @property
+    def root(self) -> Path:
+        # Resolved on use so settings loaded from .env after import still apply
+        return self._root or Path(os.getenv("CHECKPOINT_DIR", "checkpoints"))
+
+    def _job_dir(self, job_id: str) -> Path:
+        # Job ids become directory names, so refuse anything that could escape the root
+        if not job_id or job_id in (".", "..") or any(c in job_id for c in "/\\"):
+            raise ValueError(f"Invalid job id: {job_id!r}")
+        return self.root / job_id
+
+    def _write_json(self, path: Path, data: Any) -> None:
+        """Write JSON atomically so a crash never leaves a half-written checkpoint."""
+        tmp_path = path.with_suffix(".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(data, f)
+        os.replace(tmp_path, path)
+
+    def exists(self, job_id: str) -> bool:
+        return self._job_dir(job_id).is_dir()
+
+    def save_audio(
+        self,
+        job_id: str,
+        content: bytes,
+        audio_format: str,
+        metadata: Optional[dict] = None,
+    ) -> Path:
+        """
+        Persist the uploaded audio for a job.
+
+        Args:
+            job_id: The job identifier
+            content: The raw audio bytes
+            audio_format: The audio format (e.g. 'mp3', 'wav')
+            metadata: Extra JSON-serializable job details to keep with the audio
+
+        Returns:
+            Path: The path of the stored audio file
+        """
+        if not audio_format.isalnum():
+            raise ValueError(f"Invalid audio format: {audio_format!r}")
+        job_dir = self._job_dir(job_id)
+        job_dir.mkdir(parents=True, exist_ok=True)
+        audio_path = job_dir / f"audio.{audio_format}"
+        audio_path.write_bytes(content)
+        self._write_json(
+            job_dir / "job.json",
+            {
+                **(metadata or {}),
+                "audio_file": audio_path.name,
+                "audio_format": audio_format,
+            },
+        )
+        return audio_path
+
+    def load_job(self, job_id: str) -> Optional[dict]:
+        """Returns the details stored with the job's audio, or None if there are none."""
+        meta_path = self._job_dir(job_id) / "job.json"
+        if not meta_path.exists():
+            return None
+        return json.loads(meta_path.read_text(encoding="utf-8"))
+
+    def update_job(self, job_id: str, data: dict) -> None:
+        """Merge extra JSON-serializable details into the job's stored details."""
+        job_dir = self._job_dir(job_id)
+        job_dir.mkdir(parents=True, exist_ok=True)
+        self._write_json(job_dir / "job.json", {**(self.load_job(job_id) or {}), **data})
+
+    def get_audio(self, job_id: str) -> Optional[Tuple[Path, str]]:
+        """
+        Returns:
+            The stored audio path and its format, or None if the job has no audio.
+        """
+        meta = self.load_job(job_id)
+        if not meta:
+            return None
+        audio_path = self._job_dir(job_id) / meta["audio_file"]
+        if not audio_path.exists():
+            return None
+        return audio_path, meta["audio_format"]
+
+    def save_stage(self, job_id: str, stage: str, data: Any) -> None:
+        """Checkpoint the JSON-serializable output of a completed stage."""
+        if stage not in STAGES:
+            raise ValueError(f"Unknown stage: {stage}")
+        job_dir = self._job_dir(job_id)
+        job_dir.mkdir(parents=True, exist_ok=True)
+        self._write_json(job_dir / f"{stage}.json", data)
+
+    def load_stage(self, job_id: str, stage: str) -> Optional[Any]:
+        """Returns the checkpointed output of a stage, or None if it hasn't completed."""
+        stage_path = self._job_dir(job_id) / f"{stage}.json"
+        if not stage_path.exists():
+            return None
+        try:
+            return json.loads(stage_path.read_text(encoding="utf-8"))
+        except json.JSONDecodeError:
+            return None
+
+    def completed_stages(self, job_id: str) -> List[str]:
+        """Returns the stages that have a checkpoint, in stage order."""
+        job_dir = self._job_dir(job_id)
+        return [stage for stage in STAGES if (job_dir / f"{stage}.json").exists()]
+
+    def first_pending_stage(self, job_id: str) -> Optional[str]:
+        """Returns the first stage without a checkpoint, or None if the job is complete."""
+        for stage in STAGES:
+            if not (self._job_dir(job_id) / f"{stage}.json").exists():
+                return stage
+        return None
+
+    def purge_expired(
+        self, max_age_seconds: Optional[float] = None, exclude: Iterable[str] = ()
+    ) -> int:
+        """
+        Delete the checkpoints of jobs that haven't been updated within `max_age_seconds`,
+        except the jobs in `exclude` (e.g. jobs that are running).
+
+        Returns:
+            int: The number of jobs removed
+        """
+        if max_age_seconds is None:
+            max_age_seconds = float(os.getenv("CHECKPOINT_MAX_AGE_HOURS", "24")) * 3600
+        if not self.root.is_dir():
+            return 0
+
+        cutoff = time.time() - max_age_seconds
+        exclude = set(exclude)
+        removed = 0
+        for job_dir in self.root.iterdir():
+            if not job_dir.is_dir() or job_dir.name in exclude:
+                continue
+            try:
+                last_modified = max(
+                    (p.stat().st_mtime for p in job_dir.iterdir()),
+                    default=job_dir.stat().st_mtime,
+                )
+            except FileNotFoundError:
+                # A checkpoint was replaced (or the job removed) while scanning it
+                continue
+            if last_modified < cutoff:
+                shutil.rmtree(job_dir, ignore_errors=True)
+                removed += 1
+        return removed
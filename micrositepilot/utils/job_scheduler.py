@@ -0,0 +1,206 @@
+import os
+import math
+import time
+import heapq
+import itertools
+import threading
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, List, Optional
+
+
+class SchedulerFull(Exception):
+    """Raised when the job queue is full. `retry_after` is a hint in whole seconds."""
+
+    def __init__(self, message: str, retry_after: int):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class JobScheduler:
+    """
+    Runs jobs on a fixed set of worker threads, shortest estimated job first.
+
+    Each queued job is ranked by `cost + lane penalty - aging_rate * seconds waited`, so
+    short interactive jobs go first but long or batch jobs gain priority the longer they
+    wait and are never starved. Since every queued job ages at the same rate, that rank
+    reduces to a fixed heap key of `cost + lane penalty + aging_rate * enqueue time`.
+
+    Settings (environment variables):
+        SCHEDULER_WORKERS: Jobs run concurrently (default 4)
+        SCHEDULER_MAX_QUEUE: Jobs allowed to wait before submissions are refused (default 32)
+        SCHEDULER_AGING_RATE: Seconds of cost forgiven per second waited (default 1.0)
+        SCHEDULER_BATCH_PENALTY_SECONDS: Extra cost given to the batch lane (default 600)
+    """
+
+    def __init__(
+        self,
+        max_workers: Optional[int] = None,
+        max_queue: Optional[int] = None,
+        aging_rate: Optional[float] = None,
+        batch_penalty_seconds: Optional[float] = None,
+    ):
+        self.max_workers = max_workers or int(os.getenv("SCHEDULER_WORKERS", "4"))
+        self.max_queue = max_queue or int(os.getenv("SCHEDULER_MAX_QUEUE", "32"))
+        self.aging_rate = (
+            aging_rate
+            if aging_rate is not None
+            else float(os.getenv("SCHEDULER_AGING_RATE", "1.0"))
+        )
+        self.lane_penalties = {
+            "interactive": 0.0,
+            "batch": (
+                batch_penalty_seconds
+                if batch_penalty_seconds is not None
+                else float(os.getenv("SCHEDULER_BATCH_PENALTY_SECONDS", "600"))
+            ),
+        }
+
+        self._queue: List[tuple] = []
+        self._sequence = itertools.count()
+        self._condition = threading.Condition()
+        self._running: Dict[int, Dict[str, Any]] = {}
+        self._workers: List[threading.Thread] = []
+        self._shutdown = False
+        self._stats = {
+            "submitted": 0,
+            "completed": 0,
+            "failed": 0,
+            "cancelled": 0,
+            "rejected": 0,
+        }
+
+    def _start_workers(self) -> None:
+        # Called with the condition held; workers start on the first submission
+        while len(self._workers) < self.max_workers:
+            worker = threading.Thread(
+                target=self._work, name=f"job-scheduler-{len(self._workers)}", daemon=True
+            )
+            worker.start()
+            self._workers.append(worker)
+
+    def submit(
+        self, fn: Callable[[], Any], cost_seconds: float, lane: str = "interactive"
+    ) -> Future:
+        """
+        Queue a job.
+
+        Args:
+            fn: The job to run, called without arguments on a worker thread
+            cost_seconds: The job's estimated run time, used to order the queue
+            lane: 'interactive' or 'batch'
+
+        Returns:
+            Future: Resolves to the job's return value
+
+        Raises:
+            SchedulerFull: If `max_queue` jobs are already waiting
+        """
+        if lane not in self.lane_penalties:
+            raise ValueError(f"Unknown lane: {lane}")
+
+        future: Future = Future()
+        with self._condition:
+            if self._shutdown:
+                raise RuntimeError("Scheduler has been shut down")
+            if len(self._queue) >= self.max_queue:
+                self._stats["rejected"] += 1
+                raise SchedulerFull(
+                    f"Job queue is full ({self.max_queue} jobs waiting)",
+                    self._estimate_retry_after(),
+                )
+            enqueued_at = time.monotonic()
+            key = cost_seconds + self.lane_penalties[lane] + self.aging_rate * enqueued_at
+            job = {
+                "fn": fn,
+                "future": future,
+                "cost_seconds": cost_seconds,
+                "lane": lane,
+                "enqueued_at": enqueued_at,
+            }
+            heapq.heappush(self._queue, (key, next(self._sequence), job))
+            self._stats["submitted"] += 1
+            self._start_workers()
+            self._condition.notify()
+        return future
+
+    def _work(self) -> None:
+        while True:
+            with self._condition:
+                while not self._queue and not self._shutdown:
+                    self._condition.wait()
+                if self._shutdown and not self._queue:
+                    return
+                _, sequence, job = heapq.heappop(self._queue)
+                job["started_at"] = time.monotonic()
+                self._running[sequence] = job
+
+            future = job["future"]
+            try:
+                if future.set_running_or_notify_cancel():
+                    try:
+                        future.set_result(job["fn"]())
+                    except BaseException as e:
+                        future.set_exception(e)
+            finally:
+                with self._condition:
+                    del self._running[sequence]
+                    if future.cancelled():
+                        self._stats["cancelled"] += 1
+                    elif future.exception() is not None:
+                        self._stats["failed"] += 1
+                    else:
+                        self._stats["completed"] += 1
+
+    def _estimate_retry_after(self) -> int:
+        """Seconds until the running job expected to finish first is done."""
+        now = time.monotonic()
+        remaining = [
+            job["started_at"] + job["cost_seconds"] - now for job in self._running.values()
+        ]
+        return max(1, math.ceil(min(remaining, default=1)))
+
+    def metrics(self) -> Dict[str, Any]:
+        """Returns queue depth per lane, the oldest wait and job counters."""
+        with self._condition:
+            now = time.monotonic()
+            queued_by_lane = {lane: 0 for lane in self.lane_penalties}
+            for _, _, job in self._queue:
+                queued_by_lane[job["lane"]] += 1
+            return {
+                "max_workers": self.max_workers,
+                "max_queue": self.max_queue,
+                "running": len(self._running),
+                "queued": queued_by_lane,
+                "oldest_wait_seconds": round(
+                    max((now - job["enqueued_at"] for _, _, job in self._queue), default=0.0),
+                    1,
+                ),
+                **self._stats,
+            }
+
+    def shutdown(self, cancel_pending: bool = True) -> None:
+        """Stop the workers once running jobs finish, cancelling queued ones if requested."""
+        with self._condition:
+            self._shutdown = True
+            if cancel_pending:
+                for _, _, job in self._queue:
+                    job["future"].cancel()
+                    self._stats["cancelled"] += 1
+                self._queue.clear()
+            self._condition.notify_all()
+
+
+_scheduler = None
+_scheduler_lock = threading.Lock()
+
+
+def get_scheduler() -> JobScheduler:
+    """
+    Returns the shared job scheduler, building it on first call so its settings are read
+    after .env has been loaded. Worker threads start on first submission.
+    """
+    global _scheduler
+    with _scheduler_lock:
+        if _scheduler is None:
+            _scheduler = JobScheduler()
+    return _scheduler
@@ -0,0 +1,156 @@
+import os
+import time
+import logging
+import threading
+import tracemalloc
+from contextlib import contextmanager
+from typing import Any, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+MODES = ("tracemalloc", "rss")
+MB = 1024 * 1024
+
+# tracemalloc is process-wide, so it is started by the first active tracker and stopped
+# by the last one
+_tracemalloc_users = 0
+_tracemalloc_started = False
+_tracemalloc_lock = threading.Lock()
+
+
+def _read_rss() -> int:
+    """Current resident set size in bytes."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError):
+        # No procfs: the peak RSS so far is the closest portable figure
+        import resource
+        import sys
+
+        max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return max_rss if sys.platform == "darwin" else max_rss * 1024
+
+
+class StageMemoryTracker:
+    """
+    Records memory use around each stage of a job, either with tracemalloc (Python heap,
+    exact peaks, noticeable overhead) or by sampling the process RSS (everything including
+    native buffers, cheap, peak as good as the sampling interval).
+
+    Use the tracker as a context manager around the whole job. In tracemalloc mode tracing
+    then runs from the start of the job, so `before_mb`/`after_mb` are the traced heap at
+    the stage boundaries, including what earlier stages left allocated. A stage measured
+    outside the context manager traces only itself and its `before_mb` is about 0.
+
+    Both are process-wide measurements, so stage figures are only attributable to a single
+    job when jobs run one at a time (SCHEDULER_WORKERS=1).
+
+    Settings (environment variables):
+        JOB_MEMORY_PROFILE: 'tracemalloc' or 'rss' to enable tracking (default off)
+        JOB_MEMORY_SAMPLE_INTERVAL: RSS sampling interval in seconds (default 0.05)
+    """
+
+    def __init__(self, mode: Optional[str] = None):
+        mode = mode if mode is not None else os.getenv("JOB_MEMORY_PROFILE", "")
+        self.mode = mode.lower() if mode and mode.lower() in MODES else None
+        self.sample_interval = float(os.getenv("JOB_MEMORY_SAMPLE_INTERVAL", "0.05"))
+        self.stages: List[Dict[str, Any]] = []
+        self._tracing = False
+
+    @property
+    def enabled(self) -> bool:
+        return self.mode is not None
+
+    def _start_tracemalloc(self) -> None:
+        global _tracemalloc_users, _tracemalloc_started
+        with _tracemalloc_lock:
+            if _tracemalloc_users == 0 and not tracemalloc.is_tracing():
+                tracemalloc.start()
+                _tracemalloc_started = True
+            _tracemalloc_users += 1
+
+    def _stop_tracemalloc(self) -> None:
+        global _tracemalloc_users, _tracemalloc_started
+        with _tracemalloc_lock:
+            _tracemalloc_users -= 1
+            # Leave tracing alone if it was already on (e.g. python -X tracemalloc)
+            if _tracemalloc_users == 0 and _tracemalloc_started:
+                tracemalloc.stop()
+                _tracemalloc_started = False
+
+    def __enter__(self) -> "StageMemoryTracker":
+        if self.mode == "tracemalloc" and not self._tracing:
+            self._start_tracemalloc()
+            self._tracing = True
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        if self._tracing:
+            self._tracing = False
+            self._stop_tracemalloc()
+
+    @contextmanager
+    def stage(self, name: str):
+        """Measure the memory used by the enclosed block under the given stage name."""
+        if not self.enabled:
+            yield
+            return
+
+        started = time.perf_counter()
+        if self.mode == "tracemalloc":
+            stage_only = not self._tracing
+            if stage_only:
+                self._start_tracemalloc()
+            tracemalloc.reset_peak()
+            before = tracemalloc.get_traced_memory()[0]
+            try:
+                yield
+            finally:
+                after, peak = tracemalloc.get_traced_memory()
+                if stage_only:
+                    self._stop_tracemalloc()
+                self._record(name, started, before, after, peak)
+        else:
+            before = _read_rss()
+            peak = [before]
+            done = threading.Event()
+
+            def sample():
+                while not done.wait(self.sample_interval):
+                    peak[0] = max(peak[0], _read_rss())
+
+            sampler = threading.Thread(target=sample, daemon=True)
+            sampler.start()
+            try:
+                yield
+            finally:
+                done.set()
+                sampler.join()
+                after = _read_rss()
+                self._record(name, started, before, after, max(peak[0], after))
+
+    def _record(self, name: str, started: float, before: int, after: int, peak: int):
+        stage = {
+            "stage": name,
+            "seconds": round(time.perf_counter() - started, 3),
+            "before_mb": round(before / MB, 2),
+            "after_mb": round(after / MB, 2),
+            "peak_mb": round(peak / MB, 2),
+            "peak_increase_mb": round((peak - before) / MB, 2),
+        }
+        self.stages.append(stage)
+        logger.info(
+            f"Memory ({self.mode}) for stage '{name}': peak {stage['peak_mb']} MB "
+            f"(+{stage['peak_increase_mb']} MB), {stage['before_mb']} -> {stage['after_mb']} MB"
+        )
+
+    def report(self) -> Optional[Dict[str, Any]]:
+        """Returns the recorded stages and the overall peak, or None when disabled."""
+        if not self.enabled:
+            return None
+        return {
+            "mode": self.mode,
+            "peak_mb": max((s["peak_mb"] for s in self.stages), default=0.0),
+            "stages": self.stages,
+        }
@@ -1,7 +1,10 @@
 import os
+import re
 import uuid
 import requests
 import hashlib
+import threading
+from concurrent.futures import Future
 
 
 def deploy_html_file_with_digest(title, html_file_path, access_token=None):
@@ -132,3 +135,299 @@ def deploy_html_file_with_digest(title, html_file_path, access_token=None):
             "error": str(e),
             "message": f"Unexpected error during deployment of {title}",
         }
+
+
+# --- Consolidated deploys ---
+# Instead of a new site per microsite, recaps are published as /<slug>/index.html under one
+# long-lived site. Pending recaps are batched into a single digest deploy: the deploy lists
+# every file on the site by SHA1, and Netlify only asks for content it doesn't already have,
+# so unchanged and duplicate files are never uploaded again.
+
+API_BASE = "https://api.netlify.com/api/v1"
+
+
+def _slugify(title):
+    slug = re.sub(r"[^a-z0-9]+", "-", title.lower()).strip("-")
+    return f"{slug or 'recap'}-{str(uuid.uuid4())[:8]}"
+
+
+class ConsolidatedNetlifyPublisher:
+    """
+    Batches microsites into periodic digest deploys of one shared Netlify site.
+
+    Jobs queue their microsite with `submit` and finish without waiting, so a batch can
+    collect microsites from more jobs than there are scheduler workers; each job's result
+    is delivered to its `on_complete` callback after the flush.
+
+    Each flush re-reads the site's file list before deploying, so recaps published by other
+    processes or replicas to the same site are kept. Flushes from separate processes that
+    overlap (between that read and the deploy) can still drop each other's newest recaps.
+
+    Settings (environment variables):
+        NETLIFY_SITE_ID: The long-lived site to publish to (created on first flush if unset)
+        NETLIFY_FLUSH_INTERVAL_SECONDS: Maximum time a microsite waits for a deploy (default 10)
+        NETLIFY_BATCH_SIZE: Pending microsites that trigger an immediate deploy (default 20)
+    """
+
+    def __init__(
+        self, site_id=None, access_token=None, flush_interval=None, batch_size=None
+    ):
+        self.site_id = site_id or os.getenv("NETLIFY_SITE_ID")
+        self.access_token = access_token
+        self.flush_interval = flush_interval or float(
+            os.getenv("NETLIFY_FLUSH_INTERVAL_SECONDS", "10")
+        )
+        self.batch_size = batch_size or int(os.getenv("NETLIFY_BATCH_SIZE", "20"))
+        self.site_info = None
+        self._pending = []
+        # Keys of queued microsites, kept until their deploy completes
+        self._queued_keys = set()
+        self._pending_lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._flusher = None
+
+    def _headers(self, content_type="application/json"):
+        token = self.access_token or os.getenv("NETLIFY_PERSONAL_ACCESS_TOKEN")
+        if not token:
+            raise ValueError("No Netlify access token provided")
+        return {
+            "Authorization": f"Bearer {token}",
+            "User-Agent": "MicrositePilot-Deployer",
+            "Content-Type": content_type,
+        }
+
+    def submit(self, title, html_file_path, key=None, on_complete=None):
+        """
+        Queue a microsite for the next consolidated deploy without waiting for it.
+
+        Args:
+            title (str): The title used to build the microsite's path
+            html_file_path (str): Path to the HTML file to publish
+            key (str): Identifies the microsite's job; a key that is already queued isn't
+                       queued again
+            on_complete (callable): Called with the deploy result (the same shape as
+                                    deploy_html_file_with_digest, with the microsite's own
+                                    URL under the shared site) once it has been deployed
+
+        Returns:
+            dict: A pending result, or an error if the HTML file can't be read
+        """
+        try:
+            with open(html_file_path, "rb") as f:
+                html_content = f.read()
+        except FileNotFoundError:
+            return {
+                "success": False,
+                "error": "File not found",
+                "message": f"HTML file {html_file_path} not found",
+            }
+
+        pending = {
+            "success": False,
+            "pending": True,
+            "message": f"{title} is queued for the next consolidated deploy",
+        }
+        slug = _slugify(title)
+        entry = {
+            "key": key,
+            "title": title,
+            "slug": slug,
+            "path": f"/{slug}/index.html",
+            "content": html_content,
+            "sha": hashlib.sha1(html_content).hexdigest(),
+            "on_complete": on_complete,
+        }
+        with self._pending_lock:
+            if key is not None and key in self._queued_keys:
+                return pending
+            self._pending.append(entry)
+            if key is not None:
+                self._queued_keys.add(key)
+            pending_count = len(self._pending)
+            if self._flusher is None:
+                self._flusher = threading.Thread(
+                    target=self._flush_periodically, name="netlify-flusher", daemon=True
+                )
+                self._flusher.start()
+        if pending_count >= self.batch_size:
+            self._wakeup.set()
+        return pending
+
+    def publish(self, title, html_file_path):
+        """
+        Queue a microsite for the next consolidated deploy and wait for it.
+
+        Returns:
+            dict: Response in the same shape as deploy_html_file_with_digest, with the
+                  microsite's own URL under the shared site
+        """
+        future = Future()
+        result = self.submit(title, html_file_path, on_complete=future.set_result)
+        if not result.get("pending"):
+            return result
+        return future.result()
+
+    def is_pending(self, key):
+        """Whether a microsite queued under `key` is waiting for (or in) a deploy."""
+        with self._pending_lock:
+            return key in self._queued_keys
+
+    def _flush_periodically(self):
+        while True:
+            self._wakeup.wait(self.flush_interval)
+            self._wakeup.clear()
+            self.flush()
+
+    def _ensure_site(self):
+        if self.site_info is None:
+            if self.site_id:
+                response = requests.get(
+                    f"{API_BASE}/sites/{self.site_id}", headers=self._headers()
+                )
+            else:
+                response = requests.post(
+                    f"{API_BASE}/sites",
+                    headers=self._headers(),
+                    json={
+                        "name": f"micrositepilot-recaps-{str(uuid.uuid4())[:8]}",
+                        "processing_settings": {"html": {"pretty_urls": True}},
+                    },
+                )
+            response.raise_for_status()
+            self.site_info = response.json()
+            if not self.site_id:
+                self.site_id = self.site_info["id"]
+                print(
+                    f"ℹ️  Created shared Netlify site {self.site_id}, set NETLIFY_SITE_ID to reuse it"
+                )
+
+    def _site_files(self):
+        """Returns path -> SHA1 of every file currently deployed on the site."""
+        response = requests.get(
+            f"{API_BASE}/sites/{self.site_id}/files", headers=self._headers()
+        )
+        response.raise_for_status()
+        return {f["id"]: f["sha"] for f in response.json()}
+
+    def flush(self):
+        """Deploy every pending microsite in one digest deploy."""
+        with self._flush_lock:
+            with self._pending_lock:
+                batch, self._pending = self._pending, []
+            if not batch:
+                return
+
+            try:
+                self._ensure_site()
+                # A digest deploy replaces the site's whole file list, so start from what is
+                # deployed now, including recaps published by other writers to the site
+                files = self._site_files()
+                files.update({entry["path"]: entry["sha"] for entry in batch})
+
+                deploy_response = requests.post(
+                    f"{API_BASE}/sites/{self.site_id}/deploys",
+                    headers=self._headers(),
+                    json={"files": files},
+                )
+                deploy_response.raise_for_status()
+                deploy_info = deploy_response.json()
+                deploy_id = deploy_info["id"]
+
+                # Upload each required SHA once, even if several paths share it
+                contents = {entry["sha"]: entry for entry in batch}
+                for sha in deploy_info.get("required", []):
+                    if sha not in contents:
+                        raise ValueError(f"Netlify requested unknown file {sha}")
+                    upload_response = requests.put(
+                        f"{API_BASE}/deploys/{deploy_id}/files{contents[sha]['path']}",
+                        headers=self._headers("text/html"),
+                        data=contents[sha]["content"],
+                    )
+                    upload_response.raise_for_status()
+                print(
+                    f"✅ Deployed {len(batch)} microsite(s), uploaded {len(deploy_info.get('required', []))} file(s)"
+                )
+            except Exception as e:
+                for entry in batch:
+                    self._complete(
+                        entry,
+                        {
+                            "success": False,
+                            "error": str(e),
+                            "message": f"Failed to deploy {entry['title']}",
+                        },
+                    )
+                return
+
+            site_url = self.site_info.get("ssl_url") or self.site_info["url"]
+            for entry in batch:
+                self._complete(
+                    entry,
+                    {
+                        "success": True,
+                        "site": {
+                            "id": self.site_id,
+                            "name": self.site_info["name"],
+                            "url": f"{site_url}/{entry['slug']}/",
+                            "admin_url": self.site_info["admin_url"],
+                        },
+                    },
+                )
+
+    def _complete(self, entry, result):
+        # The key is released only after the callback (e.g. a checkpoint) has run, so the
+        # same job can't be queued again in between
+        if entry["on_complete"] is not None:
+            try:
+                entry["on_complete"](result)
+            except Exception as e:
+                # One failing callback mustn't keep the rest of the batch from completing
+                print(f"❌ Deploy callback for {entry['title']} failed: {e}")
+        with self._pending_lock:
+            self._queued_keys.discard(entry["key"])
+
+
+_publisher = None
+_publisher_lock = threading.Lock()
+
+
+def _get_publisher():
+    global _publisher
+    with _publisher_lock:
+        if _publisher is None:
+            _publisher = ConsolidatedNetlifyPublisher()
+    return _publisher
+
+
+def deploy_microsite(title, html_file_path, key=None, on_complete=None):
+    """
+    Deploy a microsite using the mode set by NETLIFY_DEPLOY_MODE: 'site' (default) creates a
+    new site per microsite, 'consolidated' publishes it under one shared site.
+
+    In consolidated mode with an `on_complete` callback, the microsite is queued under `key`
+    and a pending result (`"pending": True`) is returned straight away; `on_complete` gets
+    the deploy result after the next flush. Without a callback the call waits for the flush.
+
+    Returns:
+        dict: Response containing site information
+    """
+    if os.getenv("NETLIFY_DEPLOY_MODE", "site").lower() != "consolidated":
+        return deploy_html_file_with_digest(title=title, html_file_path=html_file_path)
+
+    if on_complete is None:
+        return _get_publisher().publish(title, html_file_path)
+    return _get_publisher().submit(
+        title, html_file_path, key=key, on_complete=on_complete
+    )
+
+
+def is_deploy_pending(key):
+    """Whether the microsite queued under `key` is still waiting for a consolidated deploy."""
+    return _publisher is not None and _publisher.is_pending(key)
+
+
+def flush_pending_deploys():
+    """Deploy any microsites still waiting for a consolidated deploy."""
+    if _publisher is not None:
+        _publisher.flush()
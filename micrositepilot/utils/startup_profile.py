@@ -0,0 +1,91 @@
+"""
+Import-time breakdown of the API server, for tracking cold-start regressions.
+
+Usage:
+    python -m micrositepilot.utils.startup_profile [module] [--top N] [--warm-up]
+"""
+
+import re
+import sys
+import time
+import argparse
+import subprocess
+from collections import defaultdict
+from typing import Dict, List, Tuple
+
+IMPORT_TIME_LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|(\s*)(\S+)$")
+
+
+def profile_imports(module: str = "micrositepilot.server") -> List[Tuple[str, int, int]]:
+    """
+    Import a module in a fresh interpreter with `-X importtime`.
+
+    Args:
+        module: The module to import
+
+    Returns:
+        list: (module name, self time in us, cumulative time in us) for every imported module
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"Importing {module} failed:\n{result.stderr}")
+
+    entries = []
+    for line in result.stderr.splitlines():
+        match = IMPORT_TIME_LINE.match(line)
+        if match:
+            entries.append((match.group(4), int(match.group(1)), int(match.group(2))))
+    return entries
+
+
+def summarize_by_package(entries: List[Tuple[str, int, int]]) -> Dict[str, int]:
+    """Sums the self import time (us) of every module by top-level package."""
+    totals: Dict[str, int] = defaultdict(int)
+    for name, self_us, _ in entries:
+        totals[name.split(".")[0]] += self_us
+    return dict(totals)
+
+
+def time_warm_up() -> float:
+    """Returns the seconds spent building the workflow, agents and model clients."""
+    from dotenv import load_dotenv
+    from micrositepilot import server
+
+    load_dotenv()
+    start = time.perf_counter()
+    server.get_workflow().warm_up()
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("module", nargs="?", default="micrositepilot.server")
+    parser.add_argument("--top", type=int, default=15, help="Rows to show per table")
+    parser.add_argument(
+        "--warm-up", action="store_true", help="Also time agent warm-up (needs API keys)"
+    )
+    args = parser.parse_args()
+
+    entries = profile_imports(args.module)
+    total_us = max((cumulative for _, _, cumulative in entries), default=0)
+    print(f"Import of {args.module}: {total_us / 1000:.1f} ms ({len(entries)} modules)\n")
+
+    print("By top-level package (self time):")
+    packages = sorted(summarize_by_package(entries).items(), key=lambda p: -p[1])
+    for package, self_us in packages[: args.top]:
+        print(f"  {self_us / 1000:9.1f} ms  {package}")
+
+    print("\nSlowest modules (cumulative time):")
+    for name, _, cumulative_us in sorted(entries, key=lambda e: -e[2])[: args.top]:
+        print(f"  {cumulative_us / 1000:9.1f} ms  {name}")
+
+    if args.warm_up:
+        print(f"\nWarm-up: {time_warm_up() * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,170 @@
+import re
+import json
+from difflib import SequenceMatcher
+from typing import Dict, List, Tuple
+
+from ..agents.info_extractor_agent import DemoSummary, FeatureDemonstrated
+from .transcript_format import format_timestamp, to_seconds
+
+NAME_FIELDS = ("product_name", "prospect_company", "sales_rep")
+LIST_FIELDS = ("summary_points", "pain_points_discussed", "next_steps", "unanswered_questions")
+# Two entries whose normalized text is at least this similar are treated as duplicates
+SIMILARITY_THRESHOLD = 0.85
+MAX_SUMMARY_POINTS = 5
+
+
+def _normalize(text: str) -> str:
+    return re.sub(r"\s+", " ", re.sub(r"[^\w\s]", " ", text.casefold())).strip()
+
+
+def _similar(a: str, b: str) -> bool:
+    return a == b or SequenceMatcher(None, a, b).ratio() >= SIMILARITY_THRESHOLD
+
+
+def parse_partial_summary(json_string: str) -> DemoSummary:
+    """
+    Parse the extraction of one transcript chunk. A chunk may not mention every field, so
+    missing or null fields become empty strings/lists and features without a name are dropped.
+    """
+    data = json.loads(json_string)
+    if not isinstance(data, dict):
+        raise ValueError("Extraction output is not a JSON object")
+    for field in NAME_FIELDS:
+        data[field] = data.get(field) or ""
+    for field in LIST_FIELDS:
+        data[field] = [item for item in data.get(field) or [] if isinstance(item, str)]
+    data["features_demonstrated"] = [
+        {
+            "name": feature["name"],
+            "timestamp_start": feature.get("timestamp_start") or "",
+            "timestamp_end": feature.get("timestamp_end") or "",
+        }
+        for feature in data.get("features_demonstrated") or []
+        if isinstance(feature, dict) and feature.get("name")
+    ]
+    return DemoSummary.model_validate(data)
+
+
+def _is_token_prefix(a: List[str], b: List[str]) -> bool:
+    shorter, longer = (a, b) if len(a) <= len(b) else (b, a)
+    return longer[: len(shorter)] == shorter
+
+
+def _merge_name(values: List[str]) -> Tuple[str, List[str]]:
+    """
+    Vote on a single value. Values whose words start the other's ('Acme' and 'Acme Corp')
+    count as the same candidate, represented by its longest form; partial words ('Ion' and
+    'Union Pacific') don't.
+
+    Returns:
+        The chosen value, and the tied candidates if the vote is a conflict (else empty)
+    """
+    groups: List[Dict] = []
+    for value in (v.strip() for v in values):
+        tokens = _normalize(value).split()
+        if not tokens:
+            continue
+        for group in groups:
+            if _is_token_prefix(tokens, group["tokens"]):
+                group["count"] += 1
+                if len(tokens) > len(group["tokens"]):
+                    group["tokens"], group["value"] = tokens, value
+                break
+        else:
+            groups.append({"tokens": tokens, "value": value, "count": 1})
+
+    if not groups:
+        return "", []
+    groups.sort(key=lambda g: -g["count"])
+    tied = [g["value"] for g in groups if g["count"] == groups[0]["count"]]
+    return groups[0]["value"], tied if len(tied) > 1 else []
+
+
+def _merge_list(lists: List[List[str]], limit: int = 0) -> List[str]:
+    """
+    Deduplicate items across chunks, keeping the first wording seen. With a `limit`, items
+    are taken round-robin from each chunk so the whole call stays represented.
+    """
+    seen: List[str] = []
+    per_chunk: List[List[str]] = []
+    for items in lists:
+        unique = []
+        for item in items:
+            normalized = _normalize(item)
+            if normalized and not any(_similar(normalized, s) for s in seen):
+                seen.append(normalized)
+                unique.append(item.strip())
+        per_chunk.append(unique)
+
+    if not limit:
+        return [item for items in per_chunk for item in items]
+    merged: List[str] = []
+    depth = 0
+    while len(merged) < limit and any(depth < len(items) for items in per_chunk):
+        for items in per_chunk:
+            if depth < len(items) and len(merged) < limit:
+                merged.append(items[depth])
+        depth += 1
+    return merged
+
+
+def _parse_timestamp(value: str):
+    try:
+        return to_seconds(value) if value else None
+    except ValueError:
+        return None
+
+
+def _merge_features(partials: List[DemoSummary]) -> List[FeatureDemonstrated]:
+    """Combine features with the same (or a near-identical) name, widening their time range."""
+    merged: List[Dict] = []
+    for partial in partials:
+        for feature in partial.features_demonstrated:
+            normalized = _normalize(feature.name)
+            start = _parse_timestamp(feature.timestamp_start)
+            end = _parse_timestamp(feature.timestamp_end)
+            for entry in merged:
+                if _similar(normalized, entry["key"]):
+                    if start is not None:
+                        entry["start"] = start if entry["start"] is None else min(entry["start"], start)
+                    if end is not None:
+                        entry["end"] = end if entry["end"] is None else max(entry["end"], end)
+                    break
+            else:
+                merged.append(
+                    {"key": normalized, "name": feature.name.strip(), "start": start, "end": end}
+                )
+
+    merged.sort(key=lambda e: (e["start"] is None, e["start"] or 0))
+    return [
+        FeatureDemonstrated(
+            name=entry["name"],
+            timestamp_start="" if entry["start"] is None else format_timestamp(entry["start"]),
+            timestamp_end="" if entry["end"] is None else format_timestamp(entry["end"]),
+        )
+        for entry in merged
+    ]
+
+
+def merge_summaries(partials: List[DemoSummary]) -> Tuple[DemoSummary, Dict[str, List[str]]]:
+    """
+    Merge the extractions of consecutive transcript chunks into one DemoSummary.
+
+    Returns:
+        The merged summary, and for each name field the vote couldn't settle, the tied
+        candidates (empty if there were no conflicts)
+    """
+    merged: Dict = {}
+    conflicts: Dict[str, List[str]] = {}
+    for field in NAME_FIELDS:
+        merged[field], tied = _merge_name([getattr(p, field) for p in partials])
+        if tied:
+            conflicts[field] = tied
+
+    merged["summary_points"] = _merge_list(
+        [p.summary_points for p in partials], limit=MAX_SUMMARY_POINTS
+    )
+    for field in LIST_FIELDS[1:]:
+        merged[field] = _merge_list([getattr(p, field) for p in partials])
+    merged["features_demonstrated"] = _merge_features(partials)
+    return DemoSummary.model_validate(merged), conflicts
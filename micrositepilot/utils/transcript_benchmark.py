@@ -0,0 +1,120 @@
+"""
+Compare the full and compact transcript formats.
+
+Usage:
+    python -m micrositepilot.utils.transcript_benchmark --transcript demo.txt
+    python -m micrositepilot.utils.transcript_benchmark --audio demo.mp3 [--runs 3]
+
+--transcript converts an existing full-form transcript to the compact form and compares
+token counts. --audio transcribes a recording with both agents and compares latency and
+output tokens as reported by the model.
+"""
+
+import os
+import re
+import time
+import argparse
+from pathlib import Path
+from statistics import mean
+from typing import Dict, Tuple
+
+from .transcript_format import decode_compact_transcript, encode_compact_transcript
+
+
+def count_tokens(text: str, model: str = "gemini-2.0-flash-lite") -> Tuple[int, bool]:
+    """
+    Count tokens with the Gemini API, or estimate them offline when no API key is set.
+
+    Returns:
+        The token count and whether it is exact
+    """
+    if os.getenv("GOOGLE_API_KEY"):
+        from google import genai
+
+        response = genai.Client().models.count_tokens(model=model, contents=text)
+        return response.total_tokens, True
+    # Rough offline estimate: words, numbers and punctuation each cost about one token
+    return len(re.findall(r"\w+|[^\w\s]", text)), False
+
+
+def compare_transcript(full: str) -> Dict[str, int]:
+    compact = encode_compact_transcript(full)
+    full_tokens, exact = count_tokens(full)
+    compact_tokens, _ = count_tokens(compact)
+    return {
+        "full_tokens": full_tokens,
+        "compact_tokens": compact_tokens,
+        "exact": exact,
+        "full_chars": len(full),
+        "compact_chars": len(compact),
+    }
+
+
+def _output_tokens(run_response) -> int:
+    metrics = run_response.metrics or {}
+    return sum(metrics.get("output_tokens", []))
+
+
+def benchmark_audio(audio_path: Path, runs: int = 1) -> Dict[str, Dict[str, float]]:
+    """Transcribe the recording `runs` times with each agent and time it."""
+    from agno.media import Audio
+    from ..agents.transcription_agent import (
+        get_compact_transcription_agent,
+        get_transcription_agent,
+    )
+
+    audio = Audio(content=audio_path.read_bytes(), format=audio_path.suffix[1:])
+    results = {}
+    for name, agent in (
+        ("full", get_transcription_agent()),
+        ("compact", get_compact_transcription_agent()),
+    ):
+        latencies, tokens = [], []
+        for _ in range(runs):
+            start = time.perf_counter()
+            run_response = agent.run(
+                input="Transcribe this audio exactly as heard", audio=[audio]
+            )
+            if name == "compact":
+                decode_compact_transcript(run_response.content.transcription)
+            latencies.append(time.perf_counter() - start)
+            tokens.append(_output_tokens(run_response))
+        results[name] = {"latency_seconds": mean(latencies), "output_tokens": mean(tokens)}
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("--transcript", type=Path, help="A full-form transcript file")
+    source.add_argument("--audio", type=Path, help="A recording to transcribe")
+    parser.add_argument("--runs", type=int, default=1, help="Transcriptions per format")
+    args = parser.parse_args()
+
+    from dotenv import load_dotenv
+
+    load_dotenv()
+
+    if args.transcript:
+        result = compare_transcript(args.transcript.read_text(encoding="utf-8"))
+        label = "tokens" if result["exact"] else "tokens (estimated)"
+        saving = 1 - result["compact_tokens"] / max(result["full_tokens"], 1)
+        print(f"Full:    {result['full_tokens']:>8} {label}, {result['full_chars']} chars")
+        print(f"Compact: {result['compact_tokens']:>8} {label}, {result['compact_chars']} chars")
+        print(f"Saving:  {saving:.1%}")
+        return
+
+    results = benchmark_audio(args.audio, args.runs)
+    for name, result in results.items():
+        print(
+            f"{name:<8} {result['latency_seconds']:7.2f} s  {result['output_tokens']:8.0f} output tokens"
+        )
+    full, compact = results["full"], results["compact"]
+    print(
+        f"Compact saves {1 - compact['output_tokens'] / max(full['output_tokens'], 1):.1%} "
+        f"output tokens and {1 - compact['latency_seconds'] / full['latency_seconds']:.1%} latency"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,156 @@
+import re
+from typing import Dict, List, Optional
+
+# Compact transcript format. Speakers are declared once, each segment line carries only its
+# start offset in seconds and a speaker id, and a final END line gives the end of the call:
+#
+#   S1=Sales Rep
+#   S2=Prospect
+#   0 S1 Good morning Jane thanks for joining the call
+#   5 S2 Hi Alice excited to learn more about the Microsite Pilot
+#   12 END
+#
+# decode_compact_transcript() expands it to the full form used everywhere else:
+#
+#   [00:00:00 - 00:00:05] Sales Rep: Good morning Jane thanks for joining the call
+#   [00:00:05 - 00:00:12] Prospect: Hi Alice excited to learn more about the Microsite Pilot
+
+SPEAKER_LINE = re.compile(r"^S(\d+)\s*=\s*(.+)$")
+SEGMENT_LINE = re.compile(r"^(\d+(?::\d{1,2}){0,2}(?:\.\d+)?)\s+(?:S(\d+)|(END))\b[:\s]*(.*)$")
+FULL_LINE = re.compile(
+    r"^\[(\d{1,2}:\d{2}:\d{2}) - (\d{1,2}:\d{2}:\d{2})\]\s+([^:]+?):\s?(.*)$"
+)
+
+
+def to_seconds(value: str) -> float:
+    """Parses seconds ('75', '75.5') or clock time ('1:15', '00:01:15')."""
+    seconds = 0.0
+    for part in value.split(":"):
+        seconds = seconds * 60 + float(part)
+    return seconds
+
+
+def format_timestamp(seconds: float) -> str:
+    seconds = int(seconds)
+    return f"{seconds // 3600:02d}:{seconds % 3600 // 60:02d}:{seconds % 60:02d}"
+
+
+def decode_compact_transcript(compact: str) -> str:
+    """
+    Expand a compact transcript to the `[HH:MM:SS - HH:MM:SS] Speaker Name: text` form.
+
+    Each segment ends where the next one starts; the last one ends at the END line (or at
+    its own start if the model left END out). Segments the model wrote in the full form
+    anyway are kept as they are. Other lines that don't parse are treated as a continuation
+    of the previous segment, or kept as they are if no segment precedes them, so no speech
+    is dropped. Markdown code fences are removed.
+    """
+    speakers: Dict[str, str] = {}
+    leading: List[str] = []
+    # [start, end (None until the next segment), speaker name or None for an id, id, text]
+    segments: List[List] = []
+    end: Optional[float] = None
+
+    for raw_line in compact.splitlines():
+        line = raw_line.strip()
+        if not line or line.startswith("```"):
+            continue
+        speaker = SPEAKER_LINE.match(line)
+        if speaker:
+            speakers[speaker.group(1)] = speaker.group(2).strip()
+            continue
+        segment = SEGMENT_LINE.match(line)
+        if segment:
+            start = to_seconds(segment.group(1))
+            if segment.group(3):
+                end = start
+            else:
+                segments.append(
+                    [start, None, None, segment.group(2), segment.group(4).strip()]
+                )
+            continue
+        full = FULL_LINE.match(line)
+        if full:
+            segments.append(
+                [
+                    to_seconds(full.group(1)),
+                    to_seconds(full.group(2)),
+                    full.group(3).strip(),
+                    None,
+                    full.group(4).strip(),
+                ]
+            )
+            continue
+        if segments:
+            segments[-1][4] = f"{segments[-1][4]} {line}".strip()
+        else:
+            leading.append(line)
+
+    lines = leading
+    for index, (start, segment_end, name, speaker_id, text) in enumerate(segments):
+        if segment_end is None:
+            if index + 1 < len(segments):
+                segment_end = segments[index + 1][0]
+            else:
+                segment_end = end if end is not None and end >= start else start
+        if name is None:
+            name = speakers.get(speaker_id, f"Speaker {speaker_id}")
+        lines.append(
+            f"[{format_timestamp(start)} - {format_timestamp(segment_end)}] {name}: {text}"
+        )
+    return "\n".join(lines)
+
+
+def encode_compact_transcript(full: str) -> str:
+    """
+    Convert a full-form transcript to the compact form, e.g. to compare token counts of
+    existing transcripts. Lines that aren't in the full form are kept as continuations.
+    """
+    speaker_ids: Dict[str, str] = {}
+    segment_lines: List[str] = []
+    end: Optional[str] = None
+
+    for raw_line in full.splitlines():
+        line = raw_line.strip()
+        if not line:
+            continue
+        match = FULL_LINE.match(line)
+        if not match:
+            segment_lines.append(line)
+            continue
+        start, segment_end, name, text = match.groups()
+        speaker_id = speaker_ids.setdefault(name.strip(), str(len(speaker_ids) + 1))
+        segment_lines.append(f"{int(to_seconds(start))} S{speaker_id} {text}")
+        end = segment_end
+
+    lines = [f"S{speaker_id}={name}" for name, speaker_id in speaker_ids.items()]
+    lines.extend(segment_lines)
+    if end is not None:
+        lines.append(f"{int(to_seconds(end))} END")
+    return "\n".join(lines)
+
+
+def chunk_transcript(transcript: str, max_chars: int, overlap_lines: int = 2) -> List[str]:
+    """
+    Split a transcript into chunks of at most `max_chars` on line boundaries (a single longer
+    line becomes its own chunk). Each chunk repeats the last `overlap_lines` lines of the one
+    before (while they fit in a quarter of a chunk) so an exchange cut at the boundary is seen
+    whole by at least one chunk.
+    """
+    lines = [line for line in transcript.splitlines() if line.strip()]
+    chunks: List[List[str]] = []
+    current: List[str] = []
+    size = 0  # Length of the current chunk's lines joined with newlines
+    for line in lines:
+        if current and size + 1 + len(line) > max_chars:
+            chunks.append(current)
+            current = current[-overlap_lines:] if overlap_lines else []
+            size = len("\n".join(current))
+            # Keep the overlap small next to the chunk, and never exceed the limit for it
+            if size > max_chars // 4 or size + 1 + len(line) > max_chars:
+                current, size = [], 0
+        size += len(line) + (1 if current else 0)
+        current.append(line)
+    if current:
+        chunks.append(current)
+    return ["\n".join(chunk) for chunk in chunks]
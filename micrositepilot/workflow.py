@@ -1,22 +1,37 @@
 from agno.workflow import Workflow, RunResponse, RunEvent
-from .agents.transcription_agent import transcription_agent, Transcription
-from .agents.site_builder_agent import microsite_builder_agent
-from .agents.info_extractor_agent import info_extractor
-from .utils.netlify_deployment import deploy_html_file_with_digest
+from .agents.transcription_agent import (
+    get_compact_transcription_agent,
+    get_transcription_agent,
+    Transcription,
+)
+from .agents.site_builder_agent import get_microsite_builder_agent
+from .agents.info_extractor_agent import (
+    DemoSummary,
+    build_info_extractor,
+    get_info_extractor,
+    get_summary_reconciler,
+)
+from .utils.netlify_deployment import deploy_microsite
+from .utils.job_checkpoints import JobCheckpointStore
+from .utils.audio_processing import AudioPoolFull, get_audio_pool
+from .utils.memory_profiler import StageMemoryTracker
+from .utils.summary_merge import merge_summaries, parse_partial_summary
+from .utils.transcript_format import chunk_transcript, decode_compact_transcript
 from textwrap import dedent
 from agno.agent import Agent
-from typing import Iterator, Union, Optional
+from typing import Iterator, List, Union, Optional
 from logging import Logger
 from pathlib import Path
 from agno.media import Audio
-from dotenv import load_dotenv
 import requests
 import json
+import os
 import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from pydantic import ValidationError
 from datetime import datetime
 
-load_dotenv()
-
 # It's good practice to get a logger instance here, though `logging` module needs configuration
 logger = Logger(__name__)
 
@@ -28,9 +43,37 @@ class MicroSiteGenerator(Workflow):
     """
     )
 
-    transcriber: Agent = transcription_agent
-    info_extractor: Agent = info_extractor
-    microsite_builder: Agent = microsite_builder_agent
+    checkpoints: JobCheckpointStore = JobCheckpointStore()
+
+    # --- Agents ---
+    # Agents (and their Gemini clients) are built on first use rather than at import time.
+    def _bind_agent(self, agent: Agent) -> Agent:
+        agent.workflow_id = self.workflow_id
+        agent.session_id = self.session_id
+        return agent
+
+    @property
+    def transcriber(self) -> Agent:
+        return self._bind_agent(get_transcription_agent())
+
+    @property
+    def compact_transcriber(self) -> Agent:
+        return self._bind_agent(get_compact_transcription_agent())
+
+    @property
+    def info_extractor(self) -> Agent:
+        return self._bind_agent(get_info_extractor())
+
+    @property
+    def microsite_builder(self) -> Agent:
+        return self._bind_agent(get_microsite_builder_agent())
+
+    def warm_up(self) -> None:
+        """
+        Builds all agents and their model clients ahead of the first request.
+        """
+        for agent in (self.transcriber, self.info_extractor, self.microsite_builder):
+            agent.model.get_client()
 
     def save_html_to_file(self, html_content: str) -> str:
         """
@@ -68,11 +111,50 @@ class MicroSiteGenerator(Workflow):
         audio_source: str,
         audio_format: str,
         use_transcription_cache: bool = True,
+        job_id: Optional[str] = None,
+        normalize_audio: bool = False,
     ) -> Iterator[RunResponse]:
+        """
+        Runs the transcription, extraction, HTML generation and deployment stages.
+
+        When a `job_id` is given, each stage output is checkpointed as it completes and
+        stages that already have a checkpoint are skipped, so a failed job can be resumed.
+        `normalize_audio` re-encodes the audio before transcription (see `_normalize_audio`).
+        Per-stage memory use is recorded with the job when JOB_MEMORY_PROFILE is set.
+        """
         logger.info("Microsite generation initiated.")
+        with StageMemoryTracker() as memory:
+            try:
+                yield from self._run_stages(
+                    memory,
+                    audio_source,
+                    audio_format,
+                    use_transcription_cache,
+                    job_id,
+                    normalize_audio,
+                )
+            finally:
+                if memory.enabled and job_id:
+                    self.checkpoints.update_job(job_id, {"memory": memory.report()})
 
+    def _run_stages(
+        self,
+        memory: StageMemoryTracker,
+        audio_source: str,
+        audio_format: str,
+        use_transcription_cache: bool,
+        job_id: Optional[str],
+        normalize_audio: bool,
+    ) -> Iterator[RunResponse]:
+        """
+        Runs each stage inside `memory.stage(...)` so its memory use can be reported.
+        """
         transcription_results: Optional[Transcription] = None
-        if use_transcription_cache:
+        checkpoint = self._load_checkpoint(job_id, "transcription")
+        if checkpoint:
+            logger.info(f"Resuming job {job_id} from checkpointed transcription")
+            transcription_results = Transcription.model_validate(checkpoint)
+        elif use_transcription_cache:
             transcription_results = self.get_cached_transcription(audio_source)
             if transcription_results:
                 logger.info(f"Using cached transcription for {audio_source}")
@@ -80,35 +162,76 @@ class MicroSiteGenerator(Workflow):
                 logger.info(
                     f"No cached transcription found for {audio_source}, transcribing now."
                 )
-                transcription_results = self.transcribe_audio(
-                    audio_source, audio_format
+                with memory.stage("transcription"):
+                    transcription_results = self.transcribe_audio(
+                        audio_source, audio_format, normalize=normalize_audio
+                    )
+            if transcription_results:
+                self._save_checkpoint(
+                    job_id, "transcription", transcription_results.model_dump()
                 )
         if transcription_results:
             self._add_transcription_to_cache(audio_source, transcription_results)
-            extracted_info: RunResponse = self.info_extractor.run(
-                message=transcription_results.transcription
-            )
-            extracted_info = self.remove_markdown_json_wrapper(extracted_info.content)
-            print(extracted_info)
-
-            microsite_builder_input = {
-                "extracted_info_json": extracted_info,
-                "raw_transcription": transcription_results.transcription,
-            }
-            site_html: RunResponse = microsite_builder_agent.run(
-                json.dumps(microsite_builder_input)
-            )
 
-            # Save HTML to filesystem using manual function
-            html_file_path = self.save_html_to_file(site_html.content.content)
-            logger.info(f"HTML saved to: {html_file_path}")
+            checkpoint = self._load_checkpoint(job_id, "extraction")
+            if checkpoint:
+                extracted_info = checkpoint["extracted_info"]
+            else:
+                with memory.stage("extraction"):
+                    extracted_info = self.extract_info(
+                        transcription_results.transcription
+                    )
+                print(extracted_info)
+                # Validate before checkpointing so a retry re-runs a malformed extraction
+                json.loads(extracted_info)
+                self._save_checkpoint(
+                    job_id, "extraction", {"extracted_info": extracted_info}
+                )
 
-            product_name = json.loads(extracted_info)["product_name"]
+            checkpoint = self._load_checkpoint(job_id, "html")
+            if checkpoint and Path(checkpoint["html_file_path"]).exists():
+                html_file_path = checkpoint["html_file_path"]
+            else:
+                if checkpoint:
+                    html_content = checkpoint["html_content"]
+                else:
+                    microsite_builder_input = {
+                        "extracted_info_json": extracted_info,
+                        "raw_transcription": transcription_results.transcription,
+                    }
+                    with memory.stage("html"):
+                        site_html: RunResponse = self.microsite_builder.run(
+                            json.dumps(microsite_builder_input)
+                        )
+                    html_content = site_html.content.content
+
+                # Save HTML to filesystem using manual function
+                html_file_path = self.save_html_to_file(html_content)
+                self._save_checkpoint(
+                    job_id,
+                    "html",
+                    {"html_file_path": html_file_path, "html_content": html_content},
+                )
+            logger.info(f"HTML saved to: {html_file_path}")
 
-            site_details = deploy_html_file_with_digest(
-                title=product_name,
-                html_file_path=html_file_path,
-            )
+            site_details = self._load_checkpoint(job_id, "deployment")
+            if not site_details:
+                product_name = json.loads(extracted_info)["product_name"]
+
+                with memory.stage("deployment"):
+                    # A queued consolidated deploy returns a pending result straight away
+                    # and is checkpointed by the callback once it has been deployed
+                    site_details = deploy_microsite(
+                        title=product_name,
+                        html_file_path=html_file_path,
+                        key=job_id,
+                        on_complete=(
+                            partial(self._save_deployment, job_id) if job_id else None
+                        ),
+                    )
+                # Failed deployments aren't checkpointed so a retry deploys again
+                if site_details.get("success"):
+                    self._save_checkpoint(job_id, "deployment", site_details)
 
             yield RunResponse(
                 content=site_details,
@@ -135,6 +258,93 @@ class MicroSiteGenerator(Workflow):
         # )
         # print(self.remove_markdown_json_wrapper(extracted_info.content))
 
+    def extract_info(self, transcription: str) -> str:
+        """
+        Extracts the demo summary from a transcription as a JSON string.
+
+        With EXTRACTION_MODE=map_reduce, transcriptions longer than EXTRACTION_CHUNK_CHARS
+        (default 12000) are split into chunks that are extracted concurrently (at most
+        EXTRACTION_CONCURRENCY at a time, default 4) and merged locally.
+        """
+        if os.getenv("EXTRACTION_MODE", "single").lower() == "map_reduce":
+            chunks = chunk_transcript(
+                transcription, int(os.getenv("EXTRACTION_CHUNK_CHARS", "12000"))
+            )
+            if len(chunks) > 1:
+                return self._extract_info_map_reduce(chunks)
+
+        extracted_info: RunResponse = self.info_extractor.run(message=transcription)
+        return self.remove_markdown_json_wrapper(extracted_info.content)
+
+    def _extract_chunk(
+        self, index: int, total: int, chunk: str, num_attempts: int = 2
+    ) -> DemoSummary:
+        """
+        Extracts one transcript chunk into a partial DemoSummary, retrying a failed attempt.
+        """
+        message = (
+            dedent(
+                f"""\
+                This is part {index + 1} of {total} of the call transcription. Extract only what appears in this part, using an empty string or list for anything it doesn't mention.
+
+                """
+            )
+            + chunk
+        )
+        for attempt in range(num_attempts):
+            try:
+                extractor = self._bind_agent(build_info_extractor())
+                run_response: RunResponse = extractor.run(message=message)
+                return parse_partial_summary(
+                    self.remove_markdown_json_wrapper(run_response.content)
+                )
+            except Exception as e:
+                logger.warning(
+                    f"Extraction of transcript chunk {index + 1}/{total} failed "
+                    f"(attempt {attempt + 1}/{num_attempts}): {e}"
+                )
+                if attempt + 1 == num_attempts:
+                    raise
+
+    def _extract_info_map_reduce(self, chunks: List[str]) -> str:
+        """
+        Extracts each chunk into a partial DemoSummary concurrently and merges them. The
+        reconciler agent only runs when the merge can't settle the product, prospect or rep.
+
+        Raises if any chunk can't be extracted, so the extraction stage isn't checkpointed
+        without it and a retry extracts the whole transcription again.
+        """
+        logger.info(f"Extracting information from {len(chunks)} transcript chunks")
+        max_workers = min(len(chunks), int(os.getenv("EXTRACTION_CONCURRENCY", "4")))
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            partials = list(
+                pool.map(
+                    self._extract_chunk,
+                    range(len(chunks)),
+                    [len(chunks)] * len(chunks),
+                    chunks,
+                )
+            )
+
+        summary, conflicts = merge_summaries(partials)
+        if not conflicts:
+            return summary.model_dump_json()
+
+        logger.info(f"Reconciling conflicting values for: {', '.join(conflicts)}")
+        reconciled: RunResponse = self._bind_agent(get_summary_reconciler()).run(
+            message=json.dumps(
+                {"summary": summary.model_dump(), "conflicts": conflicts}
+            )
+        )
+        try:
+            return DemoSummary.model_validate_json(
+                self.remove_markdown_json_wrapper(reconciled.content or "")
+            ).model_dump_json()
+        except ValidationError as e:
+            # Keep the majority picks rather than checkpoint an incomplete summary
+            logger.warning(f"Reconciled summary is invalid, using the merged one: {e}")
+            return summary.model_dump_json()
+
     def get_cached_transcription(
         self, audio_source: Union[str, Path, bytes]
     ) -> Optional[Transcription]:
@@ -176,6 +386,35 @@ class MicroSiteGenerator(Workflow):
             cache_key
         ] = transcription_result.model_dump()
 
+    # --- Checkpoint Functions ---
+    def _load_checkpoint(self, job_id: Optional[str], stage: str):
+        """
+        Returns the checkpointed output of a stage for the given job, if any.
+        """
+        if not job_id:
+            return None
+        return self.checkpoints.load_stage(job_id, stage)
+
+    def _save_checkpoint(self, job_id: Optional[str], stage: str, data) -> None:
+        """
+        Checkpoints the output of a completed stage for the given job.
+        """
+        if not job_id:
+            return
+        logger.info(f"Checkpointing stage '{stage}' for job {job_id}")
+        self.checkpoints.save_stage(job_id, stage, data)
+
+    def _save_deployment(self, job_id: str, site_details: dict) -> None:
+        """
+        Checkpoints a deployment that completed after the job's run (a consolidated deploy).
+        """
+        if site_details.get("success"):
+            self._save_checkpoint(job_id, "deployment", site_details)
+        else:
+            logger.error(
+                f"Deployment for job {job_id} failed: {site_details.get('error')}"
+            )
+
     def remove_markdown_json_wrapper(self, json_string_with_markdown: str) -> str:
         """
         Removes the '```json' prefix and '```' suffix from a string,
@@ -269,6 +508,33 @@ class MicroSiteGenerator(Workflow):
             return Path(str_source).read_bytes()
         raise ValueError("Unsupported audio source type.")
 
+    def _normalize_audio(
+        self, source: Union[str, Path, bytes], force: bool = False
+    ) -> Optional[str]:
+        """
+        When requested (or AUDIO_NORMALIZE=true), re-encodes a local audio file to mono 16 kHz
+        mp3 in the audio worker pool to shrink the transcription payload.
+
+        Returns:
+            The path of the normalized temp file, or None to use the original audio.
+        """
+        if not force and os.getenv("AUDIO_NORMALIZE", "false").lower() != "true":
+            return None
+        if not isinstance(source, (str, Path)) or str(source).startswith(
+            ("http://", "https://")
+        ):
+            return None
+        try:
+            future = get_audio_pool().submit_transcode(
+                source, output_format="mp3", sample_rate=16000, channels=1
+            )
+            return future.result()
+        except AudioPoolFull as e:
+            logger.warning(f"Skipping audio normalization: {e}")
+        except Exception as e:
+            logger.warning(f"Audio normalization failed, using original audio: {e}")
+        return None
+
     # --- Transcription Execution Functions ---
     def _run_transcription_agent(
         self,
@@ -277,13 +543,27 @@ class MicroSiteGenerator(Workflow):
     ):
         """
         Executes the transcription agent with the given audio bytes.
+
+        With TRANSCRIPT_FORMAT=compact the model writes the compact transcript format, which
+        needs far fewer output tokens, and it is expanded locally to the full form.
         """
         logger.info(f"Running transcription agent for audio format: {audio_format}")
+        compact = os.getenv("TRANSCRIPT_FORMAT", "full").lower() == "compact"
         try:
-            run_response: RunResponse = self.transcriber.run(
+            transcriber = self.compact_transcriber if compact else self.transcriber
+            run_response: RunResponse = transcriber.run(
                 input="Transcribe this audio exactly as heard",
                 audio=[Audio(content=audio_source_bytes, format=audio_format)],
             )
+            if compact and run_response.content:
+                transcription = decode_compact_transcript(
+                    run_response.content.transcription
+                )
+                if not transcription:
+                    # Treated as a failed attempt so the transcription is retried
+                    logger.warning("Compact transcript decoded to an empty transcription")
+                    return None
+                return Transcription(transcription=transcription)
             return run_response.content
         except Exception as e:
             logger.error(f"Transcription agent failed: {str(e)}")
@@ -294,16 +574,23 @@ class MicroSiteGenerator(Workflow):
         audio_source: Union[str, Path, bytes],
         audio_format: str = "wav",
         num_attempts: int = 3,
+        normalize: bool = False,
     ):
         """
         Manages the transcription process, including getting audio bytes and retrying the agent.
         """
         logger.info("Initiating audio transcription process.")
+        normalized_path = self._normalize_audio(audio_source, force=normalize)
+        if normalized_path:
+            audio_source, audio_format = normalized_path, Path(normalized_path).suffix[1:]
         try:
             audio_bytes = self._get_audio_bytes(audio_source)
         except (ValueError, NotImplementedError) as e:
             logger.error(f"Failed to get audio bytes: {str(e)}")
             return None
+        finally:
+            if normalized_path:
+                Path(normalized_path).unlink(missing_ok=True)
 
         for attempt in range(num_attempts):
             transcription_response = self._run_transcription_agent(
@@ -0,0 +1,98 @@
+import json
+from types import SimpleNamespace
+
+import pytest
+
+from micrositepilot import workflow as workflow_module
+from micrositepilot.agents.site_builder_agent import HtmlContent
+from micrositepilot.agents.transcription_agent import Transcription
+from micrositepilot.utils.job_checkpoints import JobCheckpointStore
+from micrositepilot.utils.transcript_format import encode_compact_transcript
+
+TRANSCRIPT = "\n".join(
+    f"[00:{i // 60:02d}:{i % 60:02d} - 00:{(i + 1) // 60:02d}:{(i + 1) % 60:02d}] "
+    f"{'Alice' if i % 2 else 'Jane'}: Line {i} of the demo call"
+    for i in range(120)
+)
+
+SUMMARY = {
+    "product_name": "Microsite Pilot",
+    "prospect_company": "Acme Corp",
+    "sales_rep": "Alice",
+    "summary_points": ["Walked through the pilot"],
+    "pain_points_discussed": ["Slow follow-ups"],
+    "features_demonstrated": [
+        {"name": "Dashboards", "timestamp_start": "00:00:05", "timestamp_end": "00:00:40"}
+    ],
+    "next_steps": ["Send a proposal"],
+    "unanswered_questions": [],
+}
+
+
+class FakeAgent:
+    """Stands in for an agno Agent: `respond(**run_kwargs)` builds each run's content."""
+
+    def __init__(self, respond):
+        self.respond = respond
+        self.calls = []
+        self.model = SimpleNamespace(get_client=lambda: None)
+
+    def run(self, *args, **kwargs):
+        if args:
+            kwargs["message"] = args[0]
+        self.calls.append(kwargs)
+        return SimpleNamespace(content=self.respond(**kwargs))
+
+
+@pytest.fixture
+def fake_agents(monkeypatch):
+    """Replaces every agent and the Netlify deployment with local fakes."""
+    agents = SimpleNamespace(
+        transcriber=FakeAgent(lambda **_: Transcription(transcription=TRANSCRIPT)),
+        compact_transcriber=FakeAgent(
+            lambda **_: Transcription(transcription=encode_compact_transcript(TRANSCRIPT))
+        ),
+        info_extractor=FakeAgent(lambda **_: json.dumps(SUMMARY)),
+        microsite_builder=FakeAgent(
+            lambda **_: HtmlContent(content="<html><body>Recap</body></html>")
+        ),
+        deployments=[],
+    )
+
+    def deploy_microsite(title, html_file_path, key=None, on_complete=None):
+        agents.deployments.append(title)
+        return {"success": True, "url": f"https://example.netlify.app/{len(agents.deployments)}"}
+
+    monkeypatch.setattr(workflow_module, "get_transcription_agent", lambda: agents.transcriber)
+    monkeypatch.setattr(
+        workflow_module, "get_compact_transcription_agent", lambda: agents.compact_transcriber
+    )
+    monkeypatch.setattr(workflow_module, "get_info_extractor", lambda: agents.info_extractor)
+    monkeypatch.setattr(workflow_module, "build_info_extractor", lambda: agents.info_extractor)
+    monkeypatch.setattr(
+        workflow_module, "get_microsite_builder_agent", lambda: agents.microsite_builder
+    )
+    monkeypatch.setattr(workflow_module, "deploy_microsite", deploy_microsite)
+    for setting in ("TRANSCRIPT_FORMAT", "EXTRACTION_MODE", "AUDIO_NORMALIZE"):
+        monkeypatch.delenv(setting, raising=False)
+    return agents
+
+
+@pytest.fixture
+def checkpoints(tmp_path):
+    return JobCheckpointStore(root=tmp_path / "checkpoints")
+
+
+@pytest.fixture
+def generator(fake_agents, checkpoints, tmp_path, monkeypatch):
+    """A MicroSiteGenerator that checkpoints and writes microsites under `tmp_path`."""
+
+    def save_html_to_file(self, html_content):
+        path = tmp_path / "microsite.html"
+        path.write_text(html_content, encoding="utf-8")
+        return str(path)
+
+    monkeypatch.setattr(workflow_module.MicroSiteGenerator, "save_html_to_file", save_html_to_file)
+    generator = workflow_module.MicroSiteGenerator()
+    generator.checkpoints = checkpoints
+    return generator
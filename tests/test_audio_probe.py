@@ -0,0 +1,30 @@
+import io
+import struct
+
+import pytest
+
+from micrositepilot.utils.audio_probe import AudioRejected, probe_audio
+
+
+def aiff(exponent, mantissa, frames=441000, channels=1):
+    comm = struct.pack(">HIH", channels, frames, 16) + struct.pack(">H", exponent)
+    comm += mantissa.to_bytes(8, "big")
+    body = b"AIFF" + b"COMM" + struct.pack(">I", len(comm)) + comm
+    return io.BytesIO(b"FORM" + struct.pack(">I", len(body)) + body)
+
+
+def test_aiff_header_is_probed():
+    # 44100 Hz as an 80-bit extended float
+    probe = probe_audio(aiff(16383 + 15, 44100 << 48))
+
+    assert probe.format == "aiff"
+    assert probe.sample_rate == 44100
+    assert probe.duration_seconds == 10.0
+
+
+@pytest.mark.parametrize("exponent, mantissa", [(0x7FFF, 1 << 63), (0, 0)])
+def test_corrupt_aiff_sample_rate_is_rejected(exponent, mantissa):
+    with pytest.raises(AudioRejected) as rejected:
+        probe_audio(aiff(exponent, mantissa))
+
+    assert rejected.value.reason == "unsupported"
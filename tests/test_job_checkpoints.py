@@ -0,0 +1,46 @@
+import os
+import time
+import uuid
+from pathlib import Path
+
+
+def make_job(checkpoints, age_seconds):
+    job_id = str(uuid.uuid4())
+    checkpoints.save_audio(job_id, b"audio", "mp3")
+    checkpoints.save_stage(job_id, "transcription", {"transcription": "Hello"})
+    past = time.time() - age_seconds
+    for path in (checkpoints.root / job_id).iterdir():
+        os.utime(path, (past, past))
+    return job_id
+
+
+def test_purge_removes_only_expired_jobs(checkpoints):
+    expired = make_job(checkpoints, 7200)
+    recent = make_job(checkpoints, 60)
+
+    assert checkpoints.purge_expired(max_age_seconds=3600) == 1
+    assert not checkpoints.exists(expired)
+    assert checkpoints.exists(recent)
+
+
+def test_purge_skips_excluded_jobs(checkpoints):
+    running = make_job(checkpoints, 7200)
+
+    assert checkpoints.purge_expired(max_age_seconds=3600, exclude={running}) == 0
+    assert checkpoints.exists(running)
+
+
+def test_purge_skips_files_replaced_while_scanning(checkpoints, monkeypatch):
+    job_id = make_job(checkpoints, 7200)
+    stat = Path.stat
+
+    def racing_stat(path, *args, **kwargs):
+        if path.parent.name == job_id:
+            raise FileNotFoundError(path)
+        return stat(path, *args, **kwargs)
+
+    monkeypatch.setattr(Path, "stat", racing_stat)
+
+    assert checkpoints.purge_expired(max_age_seconds=3600) == 0
+    monkeypatch.undo()
+    assert checkpoints.exists(job_id)
@@ -0,0 +1,14 @@
+from micrositepilot.utils import job_scheduler
+from micrositepilot.utils.job_scheduler import get_scheduler
+
+
+def test_scheduler_reads_settings_on_first_use(monkeypatch):
+    monkeypatch.setattr(job_scheduler, "_scheduler", None)
+    import micrositepilot.server  # noqa: F401
+
+    monkeypatch.setenv("SCHEDULER_WORKERS", "2")
+    monkeypatch.setenv("SCHEDULER_MAX_QUEUE", "5")
+    scheduler = get_scheduler()
+
+    assert (scheduler.max_workers, scheduler.max_queue) == (2, 5)
+    assert get_scheduler() is scheduler
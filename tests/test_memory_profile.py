@@ -0,0 +1,78 @@
+import os
+import uuid
+import logging
+
+import pytest
+
+from micrositepilot.agents.transcription_agent import Transcription
+
+MB = 1024 * 1024
+AUDIO_SIZES_MB = [1, 8, 32]
+# Transcription holds the audio once while the agent runs; an extra full copy of the audio
+# would break this bound for the larger files
+TRANSCRIPTION_PEAK_FACTOR = 1.5
+TRANSCRIPTION_ALLOWANCE_MB = 4
+# The later stages only handle the transcript, summary and HTML, never the audio
+OTHER_STAGE_PEAK_MB = 2
+
+
+def run_job(generator, checkpoints, audio_mb):
+    job_id = str(uuid.uuid4())
+    audio_path = checkpoints.save_audio(job_id, os.urandom(audio_mb * MB), "mp3")
+    responses = list(
+        generator.run(audio_source=str(audio_path), audio_format="mp3", job_id=job_id)
+    )
+    return responses[-1].content, checkpoints.load_job(job_id).get("memory")
+
+
+@pytest.fixture
+def tracemalloc_profile(monkeypatch):
+    monkeypatch.setenv("JOB_MEMORY_PROFILE", "tracemalloc")
+
+
+@pytest.mark.parametrize("audio_mb", AUDIO_SIZES_MB)
+def test_stage_peaks_stay_within_bounds(generator, checkpoints, tracemalloc_profile, audio_mb):
+    result, memory = run_job(generator, checkpoints, audio_mb)
+
+    assert result["success"]
+    assert memory["mode"] == "tracemalloc"
+    stages = {stage["stage"]: stage for stage in memory["stages"]}
+    assert list(stages) == ["transcription", "extraction", "html", "deployment"]
+
+    transcription_bound = TRANSCRIPTION_PEAK_FACTOR * audio_mb + TRANSCRIPTION_ALLOWANCE_MB
+    assert stages["transcription"]["peak_increase_mb"] < transcription_bound
+    for name in ("extraction", "html", "deployment"):
+        assert stages[name]["peak_increase_mb"] < OTHER_STAGE_PEAK_MB, name
+
+
+def test_tracing_spans_the_whole_job(generator, checkpoints, fake_agents, tracemalloc_profile):
+    # A 5 MB transcript built while the job is traced, from 1 KB of audio. The workflow keeps
+    # the transcript for the later stages, so it must show in their starting figures
+    fake_agents.transcriber.respond = lambda **_: Transcription(
+        transcription="[00:00:00 - 00:00:01] Jane: " + "word " * MB
+    )
+    job_id = str(uuid.uuid4())
+    audio_path = checkpoints.save_audio(job_id, os.urandom(1024), "mp3")
+    list(generator.run(audio_source=str(audio_path), audio_format="mp3", job_id=job_id))
+
+    stages = {s["stage"]: s for s in checkpoints.load_job(job_id)["memory"]["stages"]}
+    assert stages["transcription"]["before_mb"] < 1
+    assert stages["extraction"]["before_mb"] >= 5
+    assert stages["html"]["before_mb"] >= 5
+
+
+def test_stage_reports_are_logged(generator, checkpoints, tracemalloc_profile, caplog):
+    with caplog.at_level(logging.INFO, logger="micrositepilot.utils.memory_profiler"):
+        run_job(generator, checkpoints, 1)
+
+    logged = [r.getMessage() for r in caplog.records if r.name.endswith("memory_profiler")]
+    assert len(logged) == 4
+    assert logged[0].startswith("Memory (tracemalloc) for stage 'transcription'")
+
+
+def test_memory_is_not_recorded_when_disabled(generator, checkpoints, monkeypatch):
+    monkeypatch.delenv("JOB_MEMORY_PROFILE", raising=False)
+    result, memory = run_job(generator, checkpoints, 1)
+
+    assert result["success"]
+    assert memory is None
@@ -0,0 +1,144 @@
+import uuid
+from types import SimpleNamespace
+
+import pytest
+
+from micrositepilot import workflow as workflow_module
+from micrositepilot.utils import netlify_deployment
+from micrositepilot.utils.netlify_deployment import ConsolidatedNetlifyPublisher
+
+SITE = {
+    "id": "site-1",
+    "name": "recaps",
+    "ssl_url": "https://recaps.netlify.app",
+    "url": "http://recaps.netlify.app",
+    "admin_url": "https://app.netlify.com/sites/recaps",
+}
+
+
+class FakeResponse(SimpleNamespace):
+    def raise_for_status(self):
+        pass
+
+    def json(self):
+        return self.body
+
+
+@pytest.fixture
+def netlify(monkeypatch):
+    """Fakes the Netlify API; `deploys` collects the file lists of each deploy."""
+    api = SimpleNamespace(deploys=[], uploads=[], files={})
+
+    def get(url, headers):
+        if url.endswith("/files"):
+            return FakeResponse(body=[{"id": p, "sha": sha} for p, sha in api.files.items()])
+        return FakeResponse(body=SITE)
+
+    def post(url, headers, json):
+        # Like Netlify, a deploy replaces the site's whole file list
+        api.files = dict(json["files"])
+        api.deploys.append(json["files"])
+        return FakeResponse(body={"id": f"deploy-{len(api.deploys)}", "required": []})
+
+    def put(url, headers, data):
+        api.uploads.append(url)
+        return FakeResponse(body={})
+
+    monkeypatch.setattr(
+        netlify_deployment, "requests", SimpleNamespace(get=get, post=post, put=put)
+    )
+    return api
+
+
+@pytest.fixture
+def publisher(netlify, monkeypatch):
+    publisher = ConsolidatedNetlifyPublisher(
+        site_id="site-1", access_token="token", flush_interval=3600, batch_size=100
+    )
+    monkeypatch.setattr(netlify_deployment, "_publisher", publisher)
+    return publisher
+
+
+def write_html(tmp_path, name):
+    path = tmp_path / f"{name}.html"
+    path.write_text(f"<html>{name}</html>", encoding="utf-8")
+    return str(path)
+
+
+def test_submit_returns_before_the_deploy(publisher, netlify, tmp_path):
+    results = []
+    pending = publisher.submit(
+        "Acme Demo", write_html(tmp_path, "acme"), key="job-1", on_complete=results.append
+    )
+
+    assert pending["pending"] and not pending["success"]
+    assert publisher.is_pending("job-1")
+    assert results == [] and netlify.deploys == []
+
+    publisher.flush()
+
+    assert results[0]["success"]
+    assert results[0]["site"]["url"].startswith("https://recaps.netlify.app/acme-demo")
+    assert not publisher.is_pending("job-1")
+
+
+def test_batch_collects_more_jobs_than_workers(publisher, netlify, tmp_path):
+    results = []
+    for i in range(10):
+        publisher.submit(
+            f"Demo {i}", write_html(tmp_path, f"demo{i}"), key=f"job-{i}", on_complete=results.append
+        )
+    publisher.flush()
+
+    assert len(netlify.deploys) == 1
+    assert len(netlify.deploys[0]) == 10
+    assert all(result["success"] for result in results)
+
+
+def test_a_queued_key_is_not_queued_again(publisher, netlify, tmp_path):
+    results = []
+    html = write_html(tmp_path, "acme")
+    publisher.submit("Acme Demo", html, key="job-1", on_complete=results.append)
+    again = publisher.submit("Acme Demo", html, key="job-1", on_complete=results.append)
+    publisher.flush()
+
+    assert again["pending"]
+    assert len(results) == 1
+
+
+def test_files_published_by_other_writers_are_kept(publisher, netlify, tmp_path):
+    publisher.submit("Acme Demo", write_html(tmp_path, "acme"), key="job-1")
+    publisher.flush()
+    # Another replica publishes to the same site between this process's flushes
+    netlify.files["/globex-demo/index.html"] = "sha-from-another-writer"
+    publisher.submit("Initech Demo", write_html(tmp_path, "initech"), key="job-2")
+    publisher.flush()
+
+    assert "/globex-demo/index.html" in netlify.deploys[-1]
+    assert len(netlify.deploys[-1]) == 3
+
+
+def test_workflow_checkpoints_the_deploy_once_flushed(
+    generator, checkpoints, publisher, netlify, monkeypatch
+):
+    monkeypatch.setenv("NETLIFY_DEPLOY_MODE", "consolidated")
+    monkeypatch.setattr(
+        workflow_module, "deploy_microsite", netlify_deployment.deploy_microsite
+    )
+    job_id = str(uuid.uuid4())
+    audio_path = checkpoints.save_audio(job_id, b"audio", "mp3")
+
+    responses = list(
+        generator.run(audio_source=str(audio_path), audio_format="mp3", job_id=job_id)
+    )
+
+    assert responses[-1].content["pending"]
+    assert checkpoints.first_pending_stage(job_id) == "deployment"
+    assert netlify_deployment.is_deploy_pending(job_id)
+
+    netlify_deployment.flush_pending_deploys()
+
+    assert checkpoints.first_pending_stage(job_id) is None
+    deployment = checkpoints.load_stage(job_id, "deployment")
+    assert deployment["site"]["url"].startswith("https://recaps.netlify.app/microsite-pilot")
+    assert not netlify_deployment.is_deploy_pending(job_id)
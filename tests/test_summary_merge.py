@@ -0,0 +1,203 @@
+import json
+import uuid
+
+import pytest
+
+from micrositepilot.agents.info_extractor_agent import DemoSummary
+from micrositepilot.utils.summary_merge import (
+    _merge_features,
+    merge_summaries,
+    parse_partial_summary,
+)
+from micrositepilot.utils.transcript_format import chunk_transcript
+
+from .conftest import SUMMARY, TRANSCRIPT
+
+
+def partial(**fields):
+    return parse_partial_summary(json.dumps(fields))
+
+
+def feature(name, start="", end=""):
+    return {"name": name, "timestamp_start": start, "timestamp_end": end}
+
+
+def test_chunks_respect_the_size_limit_and_keep_every_line():
+    chunks = chunk_transcript(TRANSCRIPT, max_chars=1000)
+
+    assert len(chunks) > 1
+    assert all(len(chunk) <= 1000 for chunk in chunks)
+    chunk_lines = [line for chunk in chunks for line in chunk.splitlines()]
+    assert set(chunk_lines) == set(TRANSCRIPT.splitlines())
+
+
+def test_chunks_overlap_by_the_last_lines():
+    chunks = chunk_transcript(TRANSCRIPT, max_chars=1000, overlap_lines=2)
+
+    for previous, chunk in zip(chunks, chunks[1:]):
+        assert chunk.splitlines()[:2] == previous.splitlines()[-2:]
+
+
+def test_overlap_is_dropped_rather_than_dominating_small_chunks():
+    chunks = chunk_transcript(TRANSCRIPT, max_chars=120, overlap_lines=2)
+
+    # Two lines fit in a 120 character chunk, so repeating them would make no progress
+    chunk_lines = [line for chunk in chunks for line in chunk.splitlines()]
+    assert chunk_lines == TRANSCRIPT.splitlines()
+
+
+def test_short_transcript_is_one_chunk():
+    assert chunk_transcript(TRANSCRIPT, max_chars=len(TRANSCRIPT)) == [TRANSCRIPT]
+
+
+def test_missing_fields_in_a_partial_become_empty():
+    summary = partial(product_name=None, features_demonstrated=[{"timestamp_start": "x"}])
+
+    assert summary.product_name == ""
+    assert summary.next_steps == []
+    assert summary.features_demonstrated == []
+
+
+def test_features_are_combined_with_their_time_ranges():
+    features = _merge_features(
+        [
+            partial(features_demonstrated=[feature("Export", "00:12:00", "00:13:00")]),
+            partial(
+                features_demonstrated=[
+                    feature("Dashboards", "00:03:00", "00:05:30"),
+                    feature("export", "00:11:30", "00:12:40"),
+                ]
+            ),
+            partial(features_demonstrated=[feature("Dashboards.", "00:05:00", "00:09:15")]),
+        ]
+    )
+
+    assert [(f.name, f.timestamp_start, f.timestamp_end) for f in features] == [
+        ("Dashboards", "00:03:00", "00:09:15"),
+        ("Export", "00:11:30", "00:13:00"),
+    ]
+
+
+def test_features_without_timestamps_are_kept_last():
+    features = _merge_features(
+        [
+            partial(features_demonstrated=[feature("Mentioned only")]),
+            partial(features_demonstrated=[feature("Export", "00:01:00", "bad")]),
+        ]
+    )
+
+    assert [(f.name, f.timestamp_start, f.timestamp_end) for f in features] == [
+        ("Export", "00:01:00", ""),
+        ("Mentioned only", "", ""),
+    ]
+
+
+def test_lists_are_deduplicated():
+    summary, _ = merge_summaries(
+        [
+            partial(pain_points_discussed=["Slow reports"], next_steps=["Send proposal"]),
+            partial(pain_points_discussed=["slow reports!", "Manual exports"]),
+            partial(next_steps=["Send proposal.", "Book a follow-up"]),
+        ]
+    )
+
+    assert summary.pain_points_discussed == ["Slow reports", "Manual exports"]
+    assert summary.next_steps == ["Send proposal", "Book a follow-up"]
+
+
+def test_summary_points_are_capped_round_robin():
+    summary, _ = merge_summaries(
+        [
+            partial(summary_points=["a1 intro", "a2 pricing", "a3 security", "a4 roadmap"]),
+            partial(summary_points=["b1 dashboards", "b2 exports"]),
+        ]
+    )
+
+    assert summary.summary_points == [
+        "a1 intro",
+        "b1 dashboards",
+        "a2 pricing",
+        "b2 exports",
+        "a3 security",
+    ]
+
+
+def test_names_are_voted_with_their_longest_form():
+    summary, conflicts = merge_summaries(
+        [
+            partial(product_name="Pilot", prospect_company="Acme", sales_rep="Alice"),
+            partial(product_name="Microsite Pilot", prospect_company="Acme Corp"),
+            partial(product_name="Microsite Pilot", prospect_company="acme"),
+        ]
+    )
+
+    assert conflicts == {}
+    assert summary.product_name == "Microsite Pilot"
+    assert summary.prospect_company == "Acme Corp"
+    assert summary.sales_rep == "Alice"
+
+
+@pytest.mark.parametrize(
+    "values", [("Ion", "Union Pacific"), ("A", "Acme"), ("Pilot", "Widget")]
+)
+def test_partial_words_are_a_conflict(values):
+    _, conflicts = merge_summaries([partial(prospect_company=v) for v in values])
+
+    assert conflicts == {"prospect_company": list(values)}
+
+
+@pytest.fixture
+def map_reduce(generator, monkeypatch):
+    monkeypatch.setenv("EXTRACTION_MODE", "map_reduce")
+    monkeypatch.setenv("EXTRACTION_CHUNK_CHARS", "1000")
+    return generator
+
+
+def test_a_failed_chunk_is_retried(map_reduce, fake_agents):
+    failures = iter([True])
+
+    def respond(message, **_):
+        if "part 2 of" in message and next(failures, False):
+            raise RuntimeError("rate limited")
+        return json.dumps(SUMMARY)
+
+    fake_agents.info_extractor.respond = respond
+    summary = DemoSummary.model_validate_json(map_reduce.extract_info(TRANSCRIPT))
+
+    assert summary.product_name == SUMMARY["product_name"]
+
+
+def test_extraction_is_not_checkpointed_when_a_chunk_fails(map_reduce, checkpoints, fake_agents):
+    def respond(message, **_):
+        if "part 2 of" in message:
+            raise RuntimeError("rate limited")
+        return json.dumps(SUMMARY)
+
+    fake_agents.info_extractor.respond = respond
+    job_id = str(uuid.uuid4())
+    audio_path = checkpoints.save_audio(job_id, b"audio", "mp3")
+
+    with pytest.raises(RuntimeError, match="rate limited"):
+        list(map_reduce.run(audio_source=str(audio_path), audio_format="mp3", job_id=job_id))
+
+    assert checkpoints.first_pending_stage(job_id) == "extraction"
+    assert fake_agents.deployments == []
+
+
+def test_invalid_reconciliation_falls_back_to_the_merged_summary(
+    map_reduce, checkpoints, fake_agents, monkeypatch
+):
+    names = iter(["Pilot", "Widget"] * 10)
+    fake_agents.info_extractor.respond = lambda **_: json.dumps(
+        {**SUMMARY, "product_name": next(names)}
+    )
+    reconciler = type(fake_agents.info_extractor)(lambda **_: json.dumps({"resolved": True}))
+    monkeypatch.setattr(
+        "micrositepilot.workflow.get_summary_reconciler", lambda: reconciler
+    )
+
+    summary = DemoSummary.model_validate_json(map_reduce.extract_info(TRANSCRIPT))
+
+    assert len(reconciler.calls) == 1
+    assert summary.product_name in ("Pilot", "Widget")
+    assert summary.prospect_company == SUMMARY["prospect_company"]
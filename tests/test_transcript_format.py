@@ -0,0 +1,70 @@
+from micrositepilot.agents.transcription_agent import Transcription
+from micrositepilot.utils.transcript_format import (
+    decode_compact_transcript,
+    encode_compact_transcript,
+)
+
+from .conftest import TRANSCRIPT
+
+COMPACT = """\
+S1=Sales Rep
+S2=Prospect
+0 S1 Good morning Jane thanks for joining the call
+5 S2 Hi Alice excited to learn more about the Microsite Pilot
+12 END"""
+
+FULL = """\
+[00:00:00 - 00:00:05] Sales Rep: Good morning Jane thanks for joining the call
+[00:00:05 - 00:00:12] Prospect: Hi Alice excited to learn more about the Microsite Pilot"""
+
+
+def test_decode_expands_to_the_full_form():
+    assert decode_compact_transcript(COMPACT) == FULL
+
+
+def test_round_trip():
+    assert encode_compact_transcript(FULL) == COMPACT
+    assert decode_compact_transcript(encode_compact_transcript(TRANSCRIPT)) == TRANSCRIPT
+
+
+def test_full_form_input_is_kept():
+    assert decode_compact_transcript(FULL) == FULL
+    assert decode_compact_transcript(f"```\n{FULL}\n```") == FULL
+
+
+def test_leading_unparsed_lines_are_kept():
+    decoded = decode_compact_transcript(f"Here is the transcript:\n{COMPACT}")
+
+    assert decoded == f"Here is the transcript:\n{FULL}"
+
+
+def test_unparsed_lines_continue_the_previous_segment():
+    decoded = decode_compact_transcript("S1=Rep\n0 S1 Hello\nand welcome\n4 END")
+
+    assert decoded == "[00:00:00 - 00:00:04] Rep: Hello and welcome"
+
+
+def test_missing_end_and_unknown_speaker():
+    decoded = decode_compact_transcript("S1=Rep\n0 S1 Hello\n1:05 S3 Hi there")
+
+    assert decoded == (
+        "[00:00:00 - 00:01:05] Rep: Hello\n[00:01:05 - 00:01:05] Speaker 3: Hi there"
+    )
+
+
+def test_empty_input():
+    assert decode_compact_transcript("") == ""
+    assert decode_compact_transcript("S1=Rep\n```\n```") == ""
+
+
+def test_empty_decode_is_retried(generator, fake_agents, monkeypatch):
+    monkeypatch.setenv("TRANSCRIPT_FORMAT", "compact")
+    replies = iter(["S1=Rep\n```\n```", COMPACT])
+    fake_agents.compact_transcriber.respond = lambda **_: Transcription(
+        transcription=next(replies)
+    )
+
+    transcription = generator.transcribe_audio(b"audio", "mp3")
+
+    assert len(fake_agents.compact_transcriber.calls) == 2
+    assert transcription.transcription == FULL